@@ -1,63 +1,122 @@
 import os
-import requests
+import re
 import time
 import concurrent.futures
-from config import DOWNLOADED_VIDEOS_DIR, pathStr, ensureDirsExist
-from db_controller import db
+from config import DOWNLOAD_RETRIES, DOWNLOAD_RETRY_BACKOFF, DOWNLOAD_ENGINE, DOWNLOAD_VERIFY, ensureDirsExist
+from workspace import resolveWorkspace
+from word_job import resolveWordJob
+from clip_cache import clipCache
+from download_service import IncompleteDownload, getDownloadService, handleUnsatisfiableRange
+from async_downloader import getAsyncEngine
+from ffmpeg_runner import isValidVideo
 from tqdm import tqdm
-from utils import success, error, info, warning, highlight
+from utils import success, error, info, warning
 import sys
 
+def fetchToPart(videoUrl, partPath, service):
+    """Download videoUrl into partPath, resuming with an HTTP Range request when possible"""
+    with service.transfer(videoUrl) as session:
+        existingBytes = os.path.getsize(partPath) if os.path.exists(partPath) else 0
+        headers = {"Range": f"bytes={existingBytes}-"} if existingBytes else {}
+        
+        # Start a GET request with streaming enabled on the pooled keep-alive session. The pool blocks when
+        # it is full, so the response must be closed on every path or its connection is never given back
+        with session.get(videoUrl, stream=True, headers=headers, timeout=(10, 60)) as response:
+            if response.status_code == 416:
+                # A part that already holds the whole clip is finished; the caller verifies and renames it
+                handleUnsatisfiableRange(partPath, existingBytes, response.headers.get("Content-Range"))
+                return 0
+            
+            response.raise_for_status()
+            
+            if existingBytes and response.status_code == 206:
+                # Server honoured the range: "Content-Range: bytes start-end/total"
+                match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+                expectedBytes = int(match.group(1)) if match else None
+                mode = "ab"
+            else:
+                # No range support (200): the whole body follows, discard the partial file
+                contentLength = response.headers.get("Content-Length")
+                expectedBytes = int(contentLength) if contentLength and contentLength.isdigit() else None
+                existingBytes = 0
+                mode = "wb"
+            
+            with open(partPath, mode) as videoFile:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    if chunk:
+                        videoFile.write(chunk)
+                        service.recordTransfer(len(chunk))
+        
+        actualBytes = os.path.getsize(partPath)
+        if expectedBytes is not None and actualBytes != expectedBytes:
+            raise IncompleteDownload(f"Got {actualBytes} of {expectedBytes} bytes")
+        
+        return actualBytes - existingBytes
+
 # Function to download a single clip
-def downloadClip(word, clipIndex, videoUrl):
-    filePath = os.path.join(pathStr(DOWNLOADED_VIDEOS_DIR), f"{word}{clipIndex}.mp4")
+def downloadClip(word, clipIndex, videoUrl, workspace=None):
+    filePath = resolveWorkspace(word, workspace).downloadPath(clipIndex)
+    partPath = f"{filePath}.part"
     
-    # Skip if file already exists
+    # Skip if file already exists (only complete, verified downloads are ever renamed into place)
     if os.path.exists(filePath):
         return {"status": "skipped", "word": word, "clipIndex": clipIndex, "sizeMb": 0}
     
-    try:
-        # Start a GET request with streaming enabled
-        response = requests.get(videoUrl, stream=True)
-        response.raise_for_status()
-        
-        # Download the file
-        with open(filePath, "wb") as videoFile:
-            for chunk in response.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    videoFile.write(chunk)
-        
-        # Get file size
-        fileSizeMb = os.path.getsize(filePath) / (1024 * 1024)
-        
-        return {
-            "status": "success", 
-            "word": word, 
-            "clipIndex": clipIndex, 
-            "sizeMb": fileSizeMb
-        }
+    # Reuse a clip downloaded earlier (by a retry or another word) without touching the network
+    if clipCache.fetch(videoUrl, filePath):
+        return {"status": "cached", "word": word, "clipIndex": clipIndex, "sizeMb": 0}
+    
+    service = getDownloadService()
+    lastError = None
+    downloadedBytes = 0
+    
+    for attempt in range(DOWNLOAD_RETRIES):
+        if attempt:
+            time.sleep(DOWNLOAD_RETRY_BACKOFF * 2 ** (attempt - 1))
         
-    except Exception as e:
-        return {
-            "status": "failed", 
-            "word": word, 
-            "clipIndex": clipIndex, 
-            "error": str(e),
-            "sizeMb": 0
-        }
+        try:
+            downloadedBytes += fetchToPart(videoUrl, partPath, service)
+            
+            if DOWNLOAD_VERIFY and not isValidVideo(partPath):
+                os.remove(partPath)
+                raise IncompleteDownload("Downloaded file is not a readable video")
+            
+            os.replace(partPath, filePath)
+            clipCache.store(videoUrl, filePath)
+            service.recordTransfer(0, clipCompleted=True)
+            
+            return {
+                "status": "success", 
+                "word": word, 
+                "clipIndex": clipIndex, 
+                "sizeMb": downloadedBytes / (1024 * 1024),
+                "attempts": attempt + 1
+            }
+        except Exception as e:
+            # Keep the .part file so the next attempt (or run) can resume it
+            lastError = e
+    
+    return {
+        "status": "failed", 
+        "word": word, 
+        "clipIndex": clipIndex, 
+        "error": str(lastError),
+        "sizeMb": downloadedBytes / (1024 * 1024),
+        "attempts": DOWNLOAD_RETRIES
+    }
 
-def downloadWordVideos(targetWord, maxWorkers=4):
+def downloadWordVideos(targetWord, workspace=None, wordJob=None):
     ensureDirsExist()
+    workspace = resolveWorkspace(targetWord, workspace)
     
-    # Get word data from database
-    wordData = db.getWord(targetWord)
+    # Get word data and all of its clips from database
+    wordJob = resolveWordJob(targetWord, wordJob)
     
-    if not wordData:
+    if not wordJob:
         print(error(f"Word '{targetWord}' not found in database"))
         return
     
-    wordId = wordData['id']
-    clips = db.getClipsForWord(wordId)
+    clips = wordJob.clips
     
     if not clips:
         print(warning(f"No clips found for '{targetWord}'"))
@@ -67,54 +126,65 @@ def downloadWordVideos(targetWord, maxWorkers=4):
     
     downloadTasks = []
     for clip in clips:
-        downloadTasks.append((targetWord, clip['clip_index'], clip['video_url']))
-    
-    try:
-        userInput = 8
-        # userInput = input(f"Enter number of parallel downloads (default: {maxWorkers}): ").strip()
-        if userInput:
-            maxWorkers = int(userInput)
-            if maxWorkers < 1:
-                maxWorkers = 1
-            elif maxWorkers > 16:
-                print(warning("Too many parallel downloads may cause issues. Limiting to 16."))
-                maxWorkers = 16
-    except ValueError:
-        print(warning(f"Invalid input. Using default ({maxWorkers}) parallel downloads."))
+        downloadTasks.append((targetWord, clip.clipIndex, clip.videoUrl))
     
     successfulDownloads = 0
     failedDownloads = 0
     alreadyDownloaded = 0
+    cachedDownloads = 0
     totalSizeMb = 0
     
     progressBar = tqdm(total=totalClips, desc=f"Downloading videos for: {targetWord.upper()}", unit="clip")
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+    def recordResult(result):
+        nonlocal successfulDownloads, failedDownloads, alreadyDownloaded, cachedDownloads, totalSizeMb
+        progressBar.update(1)
+        
+        totalSizeMb += result["sizeMb"]
+        if result["status"] == "success":
+            successfulDownloads += 1
+        elif result["status"] == "skipped":
+            alreadyDownloaded += 1
+        elif result["status"] == "cached":
+            cachedDownloads += 1
+        else:
+            failedDownloads += 1
+            progressBar.write(warning(f"Clip {result['clipIndex']} failed after {result['attempts']} attempts: {result['error']}"))
+    
+    startTime = time.time()
+    if DOWNLOAD_ENGINE == "asyncio":
+        # One event loop streams every word's clips under the global concurrency and bandwidth caps
+        service = getAsyncEngine()
+        service.downloadClips(
+            [(targetWord, clipIndex, url, workspace.downloadPath(clipIndex)) for targetWord, clipIndex, url in downloadTasks],
+            onResult=recordResult
+        )
+    else:
+        # Clips from several words (e.g. pipeline workers) share the process-wide executor and session
+        service = getDownloadService()
         futureToTask = {
-            executor.submit(downloadClip, targetWord, clipIndex, url): (targetWord, clipIndex) 
+            service.submit(downloadClip, targetWord, clipIndex, url, workspace): (targetWord, clipIndex) 
             for targetWord, clipIndex, url in downloadTasks
         }
         
         for future in concurrent.futures.as_completed(futureToTask):
-            result = future.result()
-            progressBar.update(1)
-            
-            if result["status"] == "success":
-                successfulDownloads += 1
-                totalSizeMb += result["sizeMb"]
-            elif result["status"] == "skipped":
-                alreadyDownloaded += 1
-            else:
-                failedDownloads += 1
+            recordResult(future.result())
     
     progressBar.close()
+    elapsed = time.time() - startTime
+    serviceStats = service.stats()
     
-    print(f"{info('Total data downloaded:')} {totalSizeMb:.2f} MB")
+    print(f"{info('Total data downloaded:')} {totalSizeMb:.2f} MB in {elapsed:.1f}s")
+    print(info(f"Download service throughput: {serviceStats['mbPerSecond']:.2f} MB/s, {serviceStats['clipsPerSecond']:.2f} clips/s ({serviceStats['clips']} clips, {serviceStats['sizeMb']:.1f} MB this session)"))
+    if cachedDownloads:
+        print(info(f"Reused {cachedDownloads} clips from the clip cache"))
     
     if failedDownloads == 0 and successfulDownloads > 0:
         print(success(f"\nDownload complete for {targetWord}!"))
     elif failedDownloads > 0:
         print(warning(f"\nDownload completed with {failedDownloads} failures."))
+    elif cachedDownloads > 0:
+        print(success(f"\nAll clips for {targetWord} served from the clip cache!"))
     else:
         print(error("\nNo new downloads completed."))
     
@@ -122,6 +192,7 @@ def downloadWordVideos(targetWord, maxWorkers=4):
         "total": totalClips,
         "success": successfulDownloads,
         "skipped": alreadyDownloaded,
+        "cached": cachedDownloads,
         "failed": failedDownloads,
         "sizeMb": totalSizeMb
     }
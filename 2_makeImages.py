@@ -6,11 +6,13 @@ import textwrap
 from tqdm import tqdm
 from utils import success, error, info, warning, highlight
 from config import (
-    IMAGES_DIR, BACKGROUND_IMAGE, FONTS_DIR, RESOURCES_DIR,
+    BACKGROUND_IMAGE, FONTS_DIR, RESOURCES_DIR,
     WORD_FONT, MEANING_FONT, MOVIE_FONT, DEFAULT_FONT,
     pathStr, ensureDirsExist
 )
 from db_controller import db
+from workspace import resolveWorkspace
+from word_job import resolveWordJob
 
 ensureDirsExist()
 
@@ -125,7 +127,7 @@ def drawTextWithHighlights(draw, text, font, baseColor, highlightColor, highligh
         
         yPosition += font.getmask("A").getbbox()[3] * 1.5
 
-def generateImage(currentWord, currentDef, currentSubtitle, currentMovie, index, fonts):
+def generateImage(currentWord, currentDef, currentSubtitle, currentMovie, outputPath, fonts):
     try:
         originalImage = Image.open(pathStr(BACKGROUND_IMAGE))
         img = originalImage.copy()
@@ -279,7 +281,6 @@ def generateImage(currentWord, currentDef, currentSubtitle, currentMovie, index,
             anchor="mm"
         )
 
-        outputPath = os.path.join(pathStr(IMAGES_DIR), f"{currentWord}{index}.png")
         img.save(outputPath, "PNG")
 
         return videoStartHeight
@@ -287,26 +288,19 @@ def generateImage(currentWord, currentDef, currentSubtitle, currentMovie, index,
         print(error(f"Error generating image for {currentWord}: {e}"))
         return None
 
-def updateVideoStartHeight(word, clipIndex, videoStartHeight):
+def updateVideoStartHeight(batch, wordId, clip, videoStartHeight):
     if videoStartHeight is None:
         return
     
-    try:
-        wordRow = db.getWord(word)
-        if not wordRow:
-            return
-            
-        wordId = wordRow['id']
-        
-        db.updateClipVideoStartHeightByIndex(wordId, int(clipIndex), videoStartHeight)
-    except Exception as e:
-        print(error(f"Error updating database: {e}"))
+    # Later stages read the height from the word job, so keep it in step with the database
+    clip.videoStartHeight = videoStartHeight
+    batch.updateClipVideoStartHeight(wordId, clip.clipIndex, videoStartHeight)
 
 def upperText(inputString, thisWord):
     pattern = re.compile(r'\b' + re.escape(thisWord) + r'\b', re.IGNORECASE)
     return pattern.sub(thisWord.upper(), inputString)
 
-def makeImagesForWord(targetWord):
+def makeImagesForWord(targetWord, workspace=None, wordJob=None):
     fonts = {
         "word": wordFont,
         "word_large": loadFont(WORD_FONT, 100),
@@ -317,29 +311,36 @@ def makeImagesForWord(targetWord):
         "vocab": loadFont(MOVIE_FONT, 40)
     }
     
-    wordRow = db.getWord(targetWord)
-    if not wordRow:
+    workspace = resolveWorkspace(targetWord, workspace)
+    
+    wordJob = resolveWordJob(targetWord, wordJob)
+    if not wordJob:
         print(error(f"Word '{targetWord}' not found in the database."))
         return False
     
-    wordId = wordRow['id']
-    currentDef = wordRow['meaning']
+    currentDef = wordJob.meaning
     
-    clips = db.getClipsForWord(wordId)
+    clips = wordJob.clips
     if not clips:
         print(warning(f"No clip data found for {targetWord}"))
         return False
     
     clipsProcessed = 0
+    # Layout heights of all clips are written together: one transaction per word instead of one per clip
+    batch = db.writeBatch()
     progressBar = tqdm(clips, desc=f"Generating images for: {targetWord.upper()}", unit="image")
     for clip in progressBar:
-        index = clip['clip_index']
-        currentSubtitle = upperText(clip['subtitle'], targetWord)
-        currentMovie = clip['video_info']
-        videoStartHeight = generateImage(targetWord, currentDef, currentSubtitle, currentMovie, index, fonts)
-        updateVideoStartHeight(targetWord, index, videoStartHeight)
+        currentSubtitle = upperText(clip.subtitle, targetWord)
+        currentMovie = clip.videoInfo
+        videoStartHeight = generateImage(targetWord, currentDef, currentSubtitle, currentMovie, workspace.imagePath(clip.clipIndex), fonts)
+        updateVideoStartHeight(batch, wordJob.id, clip, videoStartHeight)
         clipsProcessed += 1
     
+    try:
+        batch.commit()
+    except Exception as e:
+        print(error(f"Error updating database: {e}"))
+    
     print(success(f"Generated {clipsProcessed} images for '{targetWord}'"))
     return True
 
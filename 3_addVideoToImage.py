@@ -1,96 +1,99 @@
 import os
 import sys
-import subprocess
-import contextlib
+import concurrent.futures
 from tqdm import tqdm
 from utils import success, error, info, warning, highlight
 from config import (
-    IMAGES_DIR, DOWNLOADED_VIDEOS_DIR, MERGED_VIDEOS_DIR,
-    pathStr, ensureDirsExist
+    CLIP_ENCODE_WORKERS, pathStr, ensureDirsExist
 )
-from db_controller import db
+from video_profile import videoNormalizeFilter, audioNormalizeFilter, encodeArgs
+from ffmpeg_runner import runFfmpeg
+from workspace import resolveWorkspace
+from word_job import resolveWordJob
 
 # Ensure necessary directories exist
 ensureDirsExist()
 
-class SuppressOutput:
-    def __init__(self):
-        self.null_fds = [os.open(os.devnull, os.O_RDWR) for _ in range(2)]
-        self.save_fds = [os.dup(1), os.dup(2)]
+def getThreadsPerJob(workers):
+    """Split the machine's cores between concurrent encodes so they don't oversubscribe"""
+    return max(1, (os.cpu_count() or 1) // workers)
 
-    def __enter__(self):
-        os.dup2(self.null_fds[0], 1)
-        os.dup2(self.null_fds[1], 2)
-        return self
-
-    def __exit__(self, *_):
-        os.dup2(self.save_fds[0], 1)
-        os.dup2(self.save_fds[1], 2)
-        for fd in self.null_fds + self.save_fds:
-            os.close(fd)
-
-def mergeVideoAndImage(imageLocation, videoLocation, outputLocation, videoStartHeight):
+def mergeVideoAndImage(imageLocation, videoLocation, outputLocation, videoStartHeight, threads=None):
     fixedHeight = 500
     
-    ffmpegCommand = [
-        'ffmpeg',
+    ffmpegArgs = [
         '-loop', '1', '-i', imageLocation,
         '-i', videoLocation,
-        '-filter_complex', f'[1]scale=-1:{fixedHeight}[scaled];[scaled]setpts=PTS-STARTPTS[inner];[0][inner]overlay=(W-w)/2:{videoStartHeight+60}:shortest=1[out]',
-        '-map', '[out]', '-map', '1:a',
-        '-c:a', 'copy',
-        '-c:v', 'libx264',
-        '-preset', 'medium',
-        '-crf', '23',
-        '-pix_fmt', 'yuv420p',
+        '-filter_complex',
+        f'[1]scale=-1:{fixedHeight}[scaled];[scaled]setpts=PTS-STARTPTS[inner];'
+        f'[0][inner]overlay=(W-w)/2:{videoStartHeight+60}:shortest=1,{videoNormalizeFilter()}[out];'
+        f'[1:a]{audioNormalizeFilter()}[aout]',
+        '-map', '[out]', '-map', '[aout]',
+        *encodeArgs(),
+        *(['-threads', str(threads)] if threads else []),
         '-y', outputLocation
     ]
     
-    try:
-        with SuppressOutput():
-            subprocess.run(ffmpegCommand, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
-    except Exception as e:
-        return False
+    return runFfmpeg(ffmpegArgs)
 
-def processWord(word):
-    # Get word data from database
-    wordRow = db.getWord(word)
+def processWord(word, maxWorkers=None, workspace=None, wordJob=None):
+    workspace = resolveWorkspace(word, workspace)
+    
+    # Get word data and all of its clips from database
+    wordJob = resolveWordJob(word, wordJob)
     
-    if not wordRow:
+    if not wordJob:
         print(error(f"Word '{word}' not found in database"))
         return False
-        
-    wordId = wordRow['id']
     
-    # Get all clips for this word
-    clips = db.getClipsForWord(wordId)
+    clips = wordJob.clips
     
     if not clips:
         print(warning(f"No clip data found for '{word}'"))
         return False
     
-    clipsProcessed = 0
-    
-    progressBar = tqdm(clips, desc=f"Adding videos to images for: {word.upper()}", unit="video")
-    
-    for clip in progressBar:
-        index = clip['clip_index']
-        imageLocation = os.path.join(pathStr(IMAGES_DIR), f"{word}{index}.png")
-        videoLocation = os.path.join(pathStr(DOWNLOADED_VIDEOS_DIR), f"{word}{index}.mp4")
-        outputLocation = os.path.join(pathStr(MERGED_VIDEOS_DIR), f"{word}{index}.mp4")
+    encodeTasks = []
+    for clip in clips:
+        index = clip.clipIndex
+        imageLocation = workspace.imagePath(index)
+        videoLocation = workspace.downloadPath(index)
+        outputLocation = workspace.mergedPath(index)
         
         if not os.path.exists(imageLocation) or not os.path.exists(videoLocation):
             continue
         
-        # Get videoStartHeight from database or use a default value
+        # Get videoStartHeight from the word job or use a default value
         videoStartHeight = 300  # Default value
-        if 'video_start_height' in clip.keys() and clip['video_start_height'] is not None:
-            videoStartHeight = clip['video_start_height']
+        if clip.videoStartHeight is not None:
+            videoStartHeight = clip.videoStartHeight
         
-        operationResult = mergeVideoAndImage(imageLocation, videoLocation, outputLocation, videoStartHeight)
-        if operationResult:
-            clipsProcessed += 1
+        encodeTasks.append((index, imageLocation, videoLocation, outputLocation, videoStartHeight))
+    
+    if maxWorkers is None:
+        maxWorkers = CLIP_ENCODE_WORKERS
+    maxWorkers = max(1, min(maxWorkers, len(encodeTasks) or 1))
+    threadsPerJob = getThreadsPerJob(maxWorkers) if maxWorkers > 1 else None
+    
+    clipsProcessed = 0
+    
+    progressBar = tqdm(total=len(encodeTasks), desc=f"Adding videos to images for: {word.upper()}", unit="video")
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        futureToIndex = {
+            executor.submit(mergeVideoAndImage, imageLocation, videoLocation, outputLocation, videoStartHeight, threadsPerJob): index
+            for index, imageLocation, videoLocation, outputLocation, videoStartHeight in encodeTasks
+        }
+        
+        for future in concurrent.futures.as_completed(futureToIndex):
+            result = future.result()
+            progressBar.update(1)
+            if result["success"]:
+                clipsProcessed += 1
+                progressBar.write(info(f"Clip {futureToIndex[future]}: {result['frame']} frames at {result['speed'] or 0:.2f}x"))
+            else:
+                progressBar.write(warning(f"Failed to add video {futureToIndex[future]} to image for {word}: {result['error']}"))
+    
+    progressBar.close()
     
     print(success(f"Total videos processed successfully: {clipsProcessed}"))
     
@@ -1,25 +1,18 @@
 import os
-import subprocess
-import contextlib
 from PIL import Image, ImageDraw, ImageFont
 from tqdm import tqdm
 from utils import success, error, info, warning, highlight
 from config import (
-    FONTS_DIR, IMAGES_DIR, BACKGROUND_IMAGE, MERGED_VIDEOS_DIR,
+    FONTS_DIR, IMAGES_DIR, BACKGROUND_IMAGE,
     pathStr, ensureDirsExist
 )
 from db_controller import db
+from video_profile import AUDIO_SAMPLE_RATE, videoNormalizeFilter, encodeArgs
+from ffmpeg_runner import runFfmpeg
+from workspace import resolveWorkspace
 
 ensureDirsExist()
 
-# Image file paths
-INTRO_IMAGE_PATH = os.path.join(pathStr(IMAGES_DIR), "intro.png")
-OUTRO_IMAGE_PATH = os.path.join(pathStr(IMAGES_DIR), "outro.png")
-
-# Video file paths
-INTRO_VIDEO_PATH = os.path.join(pathStr(MERGED_VIDEOS_DIR), "intro.mp4")
-OUTRO_VIDEO_PATH = os.path.join(pathStr(MERGED_VIDEOS_DIR), "outro.mp4")
-
 # Font and color setup
 FONTS = {
     "title": None,
@@ -45,22 +38,6 @@ BOLD_OFFSETS = [
     (2, -2),  (2, 0),  (2, 2)
 ]
 
-class SuppressOutput:
-    def __init__(self):
-        self.null_fds = [os.open(os.devnull, os.O_RDWR) for _ in range(2)]
-        self.save_fds = [os.dup(1), os.dup(2)]
-
-    def __enter__(self):
-        os.dup2(self.null_fds[0], 1)
-        os.dup2(self.null_fds[1], 2)
-        return self
-
-    def __exit__(self, *_):
-        os.dup2(self.save_fds[0], 1)
-        os.dup2(self.save_fds[1], 2)
-        for fd in self.null_fds + self.save_fds:
-            os.close(fd)
-
 # Image creation functions
 def loadFont(fontName, size):
     fontPaths = [
@@ -171,7 +148,7 @@ def drawFooter(draw, centerX, height, maxWidth):
     
     return footerData, ctaY
 
-def createIntroImage(word):
+def createIntroImage(word, outputPath):
     originalImage = Image.open(pathStr(BACKGROUND_IMAGE))
     img = originalImage.copy()
     draw = ImageDraw.Draw(img)
@@ -234,10 +211,10 @@ def createIntroImage(word):
         anchor="mm"
     )
     
-    img.save(INTRO_IMAGE_PATH)
-    return INTRO_IMAGE_PATH
+    img.save(outputPath)
+    return outputPath
 
-def createOutroImage():
+def createOutroImage(outputPath):
     originalImage = Image.open(pathStr(BACKGROUND_IMAGE))
     img = originalImage.copy()
     draw = ImageDraw.Draw(img)
@@ -313,8 +290,8 @@ def createOutroImage():
         anchor="mm"
     )
     
-    img.save(OUTRO_IMAGE_PATH)
-    return OUTRO_IMAGE_PATH
+    img.save(outputPath)
+    return outputPath
 
 # Video creation functions
 def createVideoFromImage(imageLocation, outputLocation, duration, fadeIn=False, fadeOut=False):
@@ -330,43 +307,36 @@ def createVideoFromImage(imageLocation, outputLocation, duration, fadeIn=False,
     elif fadeOut:
         filterComplex = ['fade=t=out:st=' + str(duration-1) + ':d=1']
         
-    filterStr = ','.join(filterComplex) if filterComplex else 'null'
+    filterStr = ','.join([videoNormalizeFilter()] + filterComplex)
     
-    ffmpegCommand = [
-        'ffmpeg',
+    ffmpegArgs = [
         '-loop', '1',
         '-i', imageLocation,
         '-f', 'lavfi',
-        '-i', 'anullsrc=r=44100:cl=stereo',
+        '-i', f'anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo',
         '-t', str(duration),
         '-vf', filterStr,
-        '-c:v', 'libx264',
-        '-c:a', 'aac',
-        '-b:a', '192k',
-        '-ar', '44100',
-        '-ac', '2',
+        *encodeArgs(),
         '-shortest',
-        '-tune', 'stillimage',
-        '-pix_fmt', 'yuv420p',
         '-y', outputLocation
     ]
     
-    try:
-        with SuppressOutput():
-            subprocess.run(ffmpegCommand, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
-    except Exception as e:
-        return False
+    result = runFfmpeg(ffmpegArgs)
+    if not result["success"]:
+        print(error(f"Error creating {os.path.basename(outputLocation)}: {result['error']}"))
+    return result["success"]
 
 # Main process function
-def createIntroOutroVideos(word):
+def createIntroOutroVideos(word, workspace=None):
+    workspace = resolveWorkspace(word, workspace)
+    
     # Track progress in steps
     steps = [
         {"name": "Loading fonts", "func": loadFonts},
-        {"name": "Creating intro image", "func": lambda: createIntroImage(word)},
-        {"name": "Creating outro image", "func": createOutroImage},
-        {"name": "Creating intro video", "func": lambda: createVideoFromImage(INTRO_IMAGE_PATH, INTRO_VIDEO_PATH, 1, fadeIn=False, fadeOut=False)},
-        {"name": "Creating outro video", "func": lambda: createVideoFromImage(OUTRO_IMAGE_PATH, OUTRO_VIDEO_PATH, 5, fadeIn=False, fadeOut=True)}
+        {"name": "Creating intro image", "func": lambda: createIntroImage(word, workspace.introImagePath())},
+        {"name": "Creating outro image", "func": lambda: createOutroImage(workspace.outroImagePath())},
+        {"name": "Creating intro video", "func": lambda: createVideoFromImage(workspace.introImagePath(), workspace.introVideoPath(), 1, fadeIn=False, fadeOut=False)},
+        {"name": "Creating outro video", "func": lambda: createVideoFromImage(workspace.outroImagePath(), workspace.outroVideoPath(), 5, fadeIn=False, fadeOut=True)}
     ]
     
     progressBar = tqdm(steps, desc=f"Creating intro/outro for: {word.upper()}", unit="step")
@@ -384,6 +354,21 @@ def createIntroOutroVideos(word):
         print(warning(f"Created {successful}/{len(steps)} intro/outro elements"))
         return False
 
+def createIntroOutroImages(word, workspace=None):
+    """Create only the intro/outro images; the single-pass renderer animates them itself"""
+    workspace = resolveWorkspace(word, workspace)
+    
+    try:
+        loadFonts()
+        createIntroImage(word, workspace.introImagePath())
+        createOutroImage(workspace.outroImagePath())
+    except Exception as e:
+        print(error(f"Error creating intro/outro images for {word}: {e}"))
+        return False
+
+    print(success(f"Successfully created intro/outro images for {word}"))
+    return True
+
 if __name__ == "__main__":
     wordInput = "abate"
     createIntroOutroVideos(wordInput) 
\ No newline at end of file
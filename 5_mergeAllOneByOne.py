@@ -1,95 +1,216 @@
 import os
 import sys
-import subprocess
-import contextlib
 from tqdm import tqdm
 from utils import success, error, info, warning, highlight
 from config import (
-    MERGED_VIDEOS_DIR, FINAL_VIDEOS_DIR,
-    pathStr, ensureDirsExist
+    FINAL_VIDEOS_DIR, pathStr, ensureDirsExist
 )
-from db_controller import db
+from video_profile import (
+    AUDIO_SAMPLE_RATE, videoNormalizeFilter, audioNormalizeFilter, encodeArgs, probeSignature
+)
+from ffmpeg_runner import runFfmpeg
+from workspace import resolveWorkspace
+from word_job import resolveWordJob
 
 # Ensure necessary directories exist
 ensureDirsExist()
 
-class SuppressOutput:
-    def __init__(self):
-        self.null_fds = [os.open(os.devnull, os.O_RDWR) for _ in range(2)]
-        self.save_fds = [os.dup(1), os.dup(2)]
-
-    def __enter__(self):
-        os.dup2(self.null_fds[0], 1)
-        os.dup2(self.null_fds[1], 2)
-        return self
+# Single-pass render settings (match the intro/outro durations of 4_createIntroOutro.py)
+INTRO_DURATION = 1
+OUTRO_DURATION = 5
+SINGLE_PASS_CLIP_HEIGHT = 500
 
-    def __exit__(self, *_):
-        os.dup2(self.save_fds[0], 1)
-        os.dup2(self.save_fds[1], 2)
-        for fd in self.null_fds + self.save_fds:
-            os.close(fd)
+def canStreamCopy(videoList):
+    """Check with ffprobe whether every video shares the codec parameters needed for -c copy"""
+    signatures = set()
+    for video in videoList:
+        signature = probeSignature(video)
+        if signature is None:
+            return False
+        signatures.add(signature)
+    
+    return len(signatures) == 1
 
 def concatVideos(videoList, outputPath):
     if not videoList:
         return False
-        
-    with open('videoList.txt', 'w') as file:
+    
+    listPath = f"{outputPath}.txt"
+    with open(listPath, 'w') as file:
         for video in videoList:
             file.write(f"file '{video}'\n")
 
-    ffmpegCommand = [
-        'ffmpeg',
+    copyArgs = [
         '-f', 'concat',
         '-safe', '0',
-        '-i', 'videoList.txt',
-        '-filter_complex', 
-        '[0:v]concat=n=' + str(len(videoList)) + ':v=1:a=1[outv][outa]',
-        '-map', '[outv]', 
-        '-map', '[outa]',
-        '-c:v', 'libx264',
-        '-c:a', 'aac',
-        '-b:a', '192k',
-        '-ar', '44100',
+        '-i', listPath,
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        '-y',
+        outputPath
+    ]
+    
+    reencodeArgs = [
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', listPath,
+        '-vf', videoNormalizeFilter(),
+        '-af', audioNormalizeFilter(),
+        *encodeArgs(),
+        '-movflags', '+faststart',
         '-y',
         outputPath
     ]
     
     try:
-        with SuppressOutput():
-            process = subprocess.run(ffmpegCommand, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            if process.returncode != 0:
-                fallbackCommand = [
-                    'ffmpeg',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', 'videoList.txt',
-                    '-c:v', 'libx264',
-                    '-c:a', 'aac',
-                    '-ar', '44100',
-                    '-y',
-                    outputPath
-                ]
-                subprocess.run(fallbackCommand, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                
-        if os.path.exists('videoList.txt'):
-            os.remove('videoList.txt')
-        return True
-    except Exception as e:
-        if os.path.exists('videoList.txt'):
-            os.remove('videoList.txt')
-        return False
+        result = None
+        if canStreamCopy(videoList):
+            result = runFfmpeg(copyArgs)
+        
+        # Streams differ (or the copy failed): re-encode into the shared profile
+        if result is None or not result["success"]:
+            result = runFfmpeg(reencodeArgs)
+        
+        if not result["success"]:
+            print(error(f"ffmpeg failed to create {os.path.basename(outputPath)}: {result['error']}"))
+        return result["success"] and os.path.exists(outputPath)
+    finally:
+        if os.path.exists(listPath):
+            os.remove(listPath)
+
+def buildSinglePassArgs(segments, outputPath):
+    """Build the ffmpeg arguments for one command that overlays, concatenates and encodes all "still" and "clip" segments"""
+    inputs = []
+    filters = []
+    concatPads = []
+    inputIndex = 0
+
+    for segmentIndex, segment in enumerate(segments):
+        videoLabel = f"v{segmentIndex}"
+        audioLabel = f"a{segmentIndex}"
+
+        if segment["kind"] == "still":
+            duration = segment["duration"]
+            inputs += ['-loop', '1', '-t', str(duration), '-i', segment["image"]]
+            inputs += ['-f', 'lavfi', '-t', str(duration), '-i', f'anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo']
+            imageIndex, silenceIndex = inputIndex, inputIndex + 1
+            inputIndex += 2
+
+            fade = f",fade=t=out:st={duration - 1}:d=1" if segment.get("fadeOut") else ""
+            filters.append(f"[{imageIndex}:v]{videoNormalizeFilter()}{fade}[{videoLabel}]")
+            filters.append(f"[{silenceIndex}:a]asetpts=PTS-STARTPTS[{audioLabel}]")
+        else:
+            inputs += ['-loop', '1', '-i', segment["image"], '-i', segment["video"]]
+            imageIndex, videoIndex = inputIndex, inputIndex + 1
+            inputIndex += 2
+
+            filters.append(
+                f"[{videoIndex}:v]scale=-1:{SINGLE_PASS_CLIP_HEIGHT},setpts=PTS-STARTPTS[inner{segmentIndex}]"
+            )
+            filters.append(
+                f"[{imageIndex}:v][inner{segmentIndex}]overlay=(W-w)/2:{segment['videoStartHeight'] + 60}:shortest=1,"
+                f"{videoNormalizeFilter()}[{videoLabel}]"
+            )
+            filters.append(f"[{videoIndex}:a]{audioNormalizeFilter()},asetpts=PTS-STARTPTS[{audioLabel}]")
+
+        concatPads.append(f"[{videoLabel}][{audioLabel}]")
 
-def mergeWordVideos(word, includeIntroOutro=True):
-    wordRow = db.getWord(word)
+    filters.append(f"{''.join(concatPads)}concat=n={len(segments)}:v=1:a=1[outv][outa]")
+
+    return [
+        *inputs,
+        '-filter_complex', ';'.join(filters),
+        '-map', '[outv]',
+        '-map', '[outa]',
+        *encodeArgs(),
+        '-movflags', '+faststart',
+        '-y',
+        outputPath
+    ]
+
+def renderWordSinglePass(word, includeIntroOutro=True, workspace=None, wordJob=None):
+    """Render the final video for a word with one encode, replacing step 3 and the concat passes"""
+    workspace = resolveWorkspace(word, workspace)
     
-    if not wordRow:
+    wordJob = resolveWordJob(word, wordJob)
+
+    if not wordJob:
         print(error(f"Word '{word}' not found in database"))
         return False
+
+    clips = wordJob.clips
+
+    if not clips:
+        print(warning(f"No clip data found for '{word}'"))
+        return False
+
+    segments = []
+
+    introImage = workspace.introImagePath()
+    outroImage = workspace.outroImagePath()
+
+    if includeIntroOutro and os.path.exists(introImage):
+        segments.append({"kind": "still", "image": introImage, "duration": INTRO_DURATION})
+
+    clipCount = 0
+    for clip in clips:
+        index = clip.clipIndex
+        imageLocation = workspace.imagePath(index)
+        videoLocation = workspace.downloadPath(index)
+
+        if not os.path.exists(imageLocation) or not os.path.exists(videoLocation):
+            continue
+
+        videoStartHeight = 300
+        if clip.videoStartHeight is not None:
+            videoStartHeight = clip.videoStartHeight
+
+        segments.append({
+            "kind": "clip",
+            "image": imageLocation,
+            "video": videoLocation,
+            "videoStartHeight": videoStartHeight
+        })
+        clipCount += 1
+
+    if clipCount == 0:
+        print(warning(f"No downloaded clips with images found for {word}"))
+        return False
+
+    if includeIntroOutro and os.path.exists(outroImage):
+        segments.append({"kind": "still", "image": outroImage, "duration": OUTRO_DURATION, "fadeOut": True})
+
+    finalOutputPath = os.path.join(pathStr(FINAL_VIDEOS_DIR), f"{word.capitalize()}.mp4")
+    ffmpegArgs = buildSinglePassArgs(segments, finalOutputPath)
+
+    print(info(f"Rendering {clipCount} clips for {word.upper()} in a single pass"))
+
+    progressBar = tqdm(desc=f"Rendering final video for: {word.upper()}", unit="frame")
+    
+    def updateProgress(progress):
+        progressBar.update(progress["frame"] - progressBar.n)
+        progressBar.set_postfix(speed=f"{progress['speed'] or 0:.2f}x")
+    
+    result = runFfmpeg(ffmpegArgs, onProgress=updateProgress)
+    progressBar.close()
+
+    if not result["success"] or not os.path.exists(finalOutputPath):
+        print(error(f"Single-pass render failed for {word} (ffmpeg exit code {result['returncode']}): {result['error']}"))
+        return False
+
+    print(success(f"Final video created successfully: {word.capitalize()}.mp4"))
+    return True
+
+def mergeWordVideos(word, includeIntroOutro=True, workspace=None, wordJob=None):
+    workspace = resolveWorkspace(word, workspace)
+    
+    wordJob = resolveWordJob(word, wordJob)
     
-    wordId = wordRow['id']
+    if not wordJob:
+        print(error(f"Word '{word}' not found in database"))
+        return False
     
-    clips = db.getClipsForWord(wordId)
+    clips = wordJob.clips
     
     if not clips:
         print(warning(f"No clip data found for '{word}'"))
@@ -97,82 +218,49 @@ def mergeWordVideos(word, includeIntroOutro=True):
     
     contentVideos = []
     
-    introPath = os.path.join(pathStr(MERGED_VIDEOS_DIR), "intro.mp4")
-    outroPath = os.path.join(pathStr(MERGED_VIDEOS_DIR), "outro.mp4")
+    introPath = workspace.introVideoPath()
+    outroPath = workspace.outroVideoPath()
     
     hasIntro = os.path.exists(introPath) and includeIntroOutro
     hasOutro = os.path.exists(outroPath) and includeIntroOutro
     
-    progressBar = tqdm(total=4, desc=f"Creating final video for: {word.upper()}", unit="step")
+    progressBar = tqdm(total=2, desc=f"Creating final video for: {word.upper()}", unit="step")
     
     # Step 1: Find all clips
     for clip in clips:
-        index = clip['clip_index']
-        videoPath = os.path.join(pathStr(MERGED_VIDEOS_DIR), f"{word}{index}.mp4")
+        videoPath = workspace.mergedPath(clip.clipIndex)
         if os.path.exists(videoPath):
             contentVideos.append(videoPath)
             
     progressBar.update(1)
 
-    if len(contentVideos) >= 1:
-        # Step 2: Merge content videos
-        contentOnlyPath = os.path.join(pathStr(FINAL_VIDEOS_DIR), f"{word}_content_temp.mp4")
-        contentResult = concatVideos(contentVideos, contentOnlyPath)
-        
-        if not contentResult:
-            progressBar.close()
-            print(error(f"Failed to merge content videos for {word}"))
-            return False
-            
-        progressBar.update(1)
-        
-        finalOutputPath = os.path.join(pathStr(FINAL_VIDEOS_DIR), f"{word.capitalize()}.mp4")
-        
-        # If no intro/outro needed, just rename the content file
-        if not hasIntro and not hasOutro:
-            try:
-                os.rename(contentOnlyPath, finalOutputPath)
-                progressBar.update(2)
-                progressBar.close()
-                
-                print(success(f"Final video created successfully: {word.capitalize()}.mp4"))
-                return True
-            except Exception as e:
-                progressBar.close()
-                print(error(f"Error renaming file: {e}"))
-                return False
-        
-        # Step 3: Prepare for adding intro/outro
-        progressBar.update(1)
-        
-        finalList = []
-        if hasIntro:
-            finalList.append(introPath)
-        
-        finalList.append(contentOnlyPath)
-        
-        if hasOutro:
-            finalList.append(outroPath)
-        
-        # Step 4: Final merge with intro/outro
-        finalResult = concatVideos(finalList, finalOutputPath)
-        
-        if os.path.exists(contentOnlyPath):
-            os.remove(contentOnlyPath)
-            
-        progressBar.update(1)
-        progressBar.close()
-            
-        if finalResult:
-            print(success(f"Final video created successfully: {word.capitalize()}.mp4"))
-            return True
-        else:
-            print(error(f"Failed to create final video for {word}"))
-            return False
-    else:
+    if not contentVideos:
         progressBar.close()
         print(warning(f"No merged videos found for {word}"))
         return False
+    
+    finalList = []
+    if hasIntro:
+        finalList.append(introPath)
+    
+    finalList.extend(contentVideos)
+    
+    if hasOutro:
+        finalList.append(outroPath)
+    
+    # Step 2: Merge intro, clips and outro in one pass (stream copy when the profiles match)
+    finalOutputPath = os.path.join(pathStr(FINAL_VIDEOS_DIR), f"{word.capitalize()}.mp4")
+    finalResult = concatVideos(finalList, finalOutputPath)
+    
+    progressBar.update(1)
+    progressBar.close()
+    
+    if finalResult:
+        print(success(f"Final video created successfully: {word.capitalize()}.mp4"))
+        return True
+    else:
+        print(error(f"Failed to create final video for {word}"))
+        return False
 
 if __name__ == "__main__":
     includeIntroOutro = True
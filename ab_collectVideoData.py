@@ -12,7 +12,10 @@ import asyncio
 import threading
 import signal
 import platform
+import queue
+import shutil
 from multiprocessing import Process, Queue
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -21,51 +24,75 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from utils import error, warning, info
-from config import JSON_FILE, SCR_CHROME_DATA_DIR, DEBUGGING_PORT, pathStr, ensureDirsExist
+from json_stream import iterJsonObject
+from scrape_journal import ScrapeJournal, startEvent, clipEvent, wordEvent
+from playphrase_api import getPlayphraseClient
+from clip_rules import ClipFilter, collectedUrls, CLIPS_PER_WORD
+from word_ingest import WordIngestor
+from config import (
+    JSON_FILE, SCR_CHROME_DATA_DIR, DEBUGGING_PORT, CHROME_PATH as CONFIG_CHROME_PATH, SCRAPE_SESSIONS,
+    SCRAPE_WAIT_TIMEOUT, SCRAPE_POLL_INTERVAL, SCRAPE_COLLECTOR,
+    SCRAPE_BLOCK_RESOURCES, SCRAPE_MAX_POSITIONS, SCRAPE_INGEST_DB, pathStr, ensureDirsExist
+)
 
 ensureDirsExist()
 
 USER_DATA_DIR = pathStr(SCR_CHROME_DATA_DIR)
 
-if platform.system() == "Windows":
-    CHROME_PATH = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
-    if not os.path.exists(CHROME_PATH):
-        CHROME_PATH = "C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe"
-        if not os.path.exists(CHROME_PATH):
-            localAppData = os.environ.get('LOCALAPPDATA', '')
-            possiblePath = os.path.join(localAppData, "Google\\Chrome\\Application\\chrome.exe")
-            if os.path.exists(possiblePath):
-                CHROME_PATH = possiblePath
-else:
-    CHROME_PATH = "/usr/bin/google-chrome"
-    if not os.path.exists(CHROME_PATH):
-        CHROME_PATH = "/usr/bin/google-chrome-stable"
-    if not os.path.exists(CHROME_PATH):
-        CHROME_PATH = "/snap/bin/chromium"
-    if not os.path.exists(CHROME_PATH):
-        try:
-            CHROME_PATH = subprocess.check_output(["which", "google-chrome"], text=True).strip()
-        except subprocess.CalledProcessError:
+_chromePath = None
+
+class ScrapeSessionError(Exception):
+    """A scraper session could not run; raised to the coordinator instead of exiting from a worker thread"""
+    pass
+
+def getChromePath():
+    """Find the Chrome executable the first time a browser session is needed"""
+    global _chromePath
+    if _chromePath:
+        return _chromePath
+    
+    if CONFIG_CHROME_PATH and os.path.exists(CONFIG_CHROME_PATH):
+        chromePath = CONFIG_CHROME_PATH
+    elif platform.system() == "Windows":
+        chromePath = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+        if not os.path.exists(chromePath):
+            chromePath = "C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe"
+            if not os.path.exists(chromePath):
+                localAppData = os.environ.get('LOCALAPPDATA', '')
+                possiblePath = os.path.join(localAppData, "Google\\Chrome\\Application\\chrome.exe")
+                if os.path.exists(possiblePath):
+                    chromePath = possiblePath
+    else:
+        chromePath = "/usr/bin/google-chrome"
+        if not os.path.exists(chromePath):
+            chromePath = "/usr/bin/google-chrome-stable"
+        if not os.path.exists(chromePath):
+            chromePath = "/snap/bin/chromium"
+        if not os.path.exists(chromePath):
             try:
-                CHROME_PATH = subprocess.check_output(["which", "chrome"], text=True).strip()
+                chromePath = subprocess.check_output(["which", "google-chrome"], text=True).strip()
             except subprocess.CalledProcessError:
-                print("❌ Chrome executable not found. Please install Chrome or specify its path.")
-                print("💡 You can set the CHROME_PATH in the .env file.")
-                sys.exit(1)
+                try:
+                    chromePath = subprocess.check_output(["which", "chrome"], text=True).strip()
+                except subprocess.CalledProcessError:
+                    print("💡 You can set the CHROME_PATH in the .env file.")
+                    raise ScrapeSessionError("Chrome executable not found. Please install Chrome or specify its path.")
 
-if not os.path.exists(CHROME_PATH):
-    print(error(f"❌ Chrome executable not found at {CHROME_PATH}"))
-    print(error("💡 Please ensure Chrome is installed or provide the correct path in your .env file."))
-    sys.exit(1)
+    if not os.path.exists(chromePath):
+        print(error("💡 Please ensure Chrome is installed or provide the correct path in your .env file."))
+        raise ScrapeSessionError(f"Chrome executable not found at {chromePath}")
 
-print(f"🔍 Chrome executable: {CHROME_PATH}")
+    print(f"🔍 Chrome executable: {chromePath}")
+    _chromePath = chromePath
+    return chromePath
 
 def loadJsonData():
     """Load the JSON data from file"""
     try:
-        with open(pathStr(JSON_FILE), "r") as file:
-            return json.load(file)
+        # The scraper updates entries in place, so it keeps them all in a dict
+        return dict(iterJsonObject(pathStr(JSON_FILE)))
     except FileNotFoundError:
         print(f"📄 JSON file not found at {pathStr(JSON_FILE)}. Creating a new one.")
         return {}
@@ -74,39 +101,99 @@ def loadJsonData():
         return {}
 
 def saveJsonData(data):
-    """Save the JSON data to file"""
-    with open(pathStr(JSON_FILE), "w") as file:
-        json.dump(data, file, indent=2)
+    """Save the JSON data to file and empty the checkpoint journal"""
+    # Written entry by entry to a temporary file, so a crash mid-save can't truncate the JSON file
+    journal.compact(data)
     print("💾 Data saved to JSON file")
 
 data = loadJsonData()
+# Clips are checkpointed to an append-only journal; replay whatever an interrupted run left behind
+journal = ScrapeJournal()
+replayedEvents = journal.replay(data)
+if replayedEvents:
+    print(f"♻️  Recovered {replayedEvents} journaled events from the last run")
+    saveJsonData(data)
+
+# Video URLs already collected for any word; clips reusing one are skipped while scraping
+clipFilter = ClipFilter(collectedUrls(data))
+
+# Finished words go straight into greWords.db, so they can be rendered without the clean and convert scripts
+ingestor = WordIngestor() if SCRAPE_INGEST_DB else None
 
-def startChromeSession():
+# Chrome's profile lock files and sockets; a running Chrome holds them, and a copied profile must not carry them over
+PROFILE_LOCK_FILES = ("Singleton*", "*.lock", "lockfile")
+
+def sessionProfile(sessionIndex):
+    """Return the debugging port and profile directory of a scraper session"""
+    # Session 0 is the original single session; the others get their own copy of its profile,
+    # because two Chrome instances can't share a user data directory
+    port = int(DEBUGGING_PORT) + sessionIndex
+    if sessionIndex == 0:
+        return port, USER_DATA_DIR
+
+    userDataDir = f"{USER_DATA_DIR}_{sessionIndex}"
+    if not os.path.exists(userDataDir):
+        print(f"📁 Copying Chrome profile for session {sessionIndex}")
+        if os.path.exists(USER_DATA_DIR):
+            # Copied under a temporary name, so a copy that fails halfway is never reused as a profile
+            partialDir = f"{userDataDir}.partial"
+            shutil.rmtree(partialDir, ignore_errors=True)
+            try:
+                shutil.copytree(USER_DATA_DIR, partialDir, ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES),
+                                symlinks=True, ignore_dangling_symlinks=True)
+                os.replace(partialDir, userDataDir)
+            except (shutil.Error, OSError) as e:
+                shutil.rmtree(partialDir, ignore_errors=True)
+                raise ScrapeSessionError(f"Could not copy the Chrome profile for session {sessionIndex}: {e}") from e
+        else:
+            os.makedirs(userDataDir)
+    return port, userDataDir
+
+def startChromeSession(port=DEBUGGING_PORT, userDataDir=USER_DATA_DIR):
     """Start Chrome browser and connect to it with Selenium"""
-    print("🚀 Starting Chrome browser...")
+    print(f"🚀 Starting Chrome browser on port {port}...")
     
     chromeProcess = subprocess.Popen([
-        CHROME_PATH,
-        f"--remote-debugging-port={DEBUGGING_PORT}",
-        f"--user-data-dir={USER_DATA_DIR}",
+        getChromePath(),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={userDataDir}",
         "--disable-notifications",
         "--no-first-run",
         "--no-default-browser-check",
-        "--disable-blink-features=AutomationControlled"
+        "--disable-blink-features=AutomationControlled",
+        "--autoplay-policy=user-gesture-required",
+        "--mute-audio"
     ])
     
     sleep(1)
     
     options = Options()
-    options.add_experimental_option("debuggerAddress", f"localhost:{DEBUGGING_PORT}")
+    options.add_experimental_option("debuggerAddress", f"localhost:{port}")
+    # Network events go to the performance log, which is how the scraper measures its bandwidth
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
     
     driver = webdriver.Chrome(options=options)
+    if SCRAPE_BLOCK_RESOURCES:
+        blockHeavyResources(driver)
     
     return driver, chromeProcess
 
-def cleanupChrome(driver, chromeProcess):
+# The scraper reads the video URL from the DOM, so the videos, images and fonts themselves are never needed
+BLOCKED_URL_PATTERNS = [
+    "*.mp4*", "*.webm*", "*.m3u8*",
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*",
+    "*.woff*", "*.ttf*", "*.otf*"
+]
+
+def blockHeavyResources(driver):
+    """Make Chrome drop media, image and font requests through the DevTools protocol"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+def cleanupChrome(driver, chromeProcess, port=DEBUGGING_PORT):
     """Close Chrome browser and clean up processes"""
-    print(f"🧹 Cleaning up Chrome session on port {DEBUGGING_PORT}")
+    print(f"🧹 Cleaning up Chrome session on port {port}")
     
     try:
         if driver:
@@ -126,119 +213,312 @@ def cleanupChrome(driver, chromeProcess):
         except:
             pass
 
-def processWord(driver, word):
-    """Process a single word and collect its clips"""
+def recordEvent(event):
+    """Apply a scraped event to the word data and checkpoint it in the journal"""
+    journal.record(data, event)
+    if event["type"] == "word":
+        if ingestor:
+            ingestor.ingest(event["word"], data[event["word"]])
+        # The JSON file is only rewritten every few finished words
+        journal.maybeCompact(data)
+
+# Counts subtitle DOM mutations in the player so the scraper can tell when a new clip's subtitle has rendered
+INSTALL_OBSERVER_SCRIPT = """
+if (!window.__scrapeBridge) {
+    const bridge = window.__scrapeBridge = {subtitleVersion: 0};
+    new MutationObserver(mutations => {
+        for (const mutation of mutations) {
+            const node = mutation.target.nodeType === Node.ELEMENT_NODE ? mutation.target : mutation.target.parentElement;
+            if (node && node.tagName !== 'VIDEO' && node.closest('.video-player-container')) {
+                bridge.subtitleVersion++;
+                return;
+            }
+        }
+    }).observe(document.body, {subtree: true, childList: true, characterData: true});
+}
+"""
+
+# Reads the current clip in one round trip instead of a find_element call per field
+READ_CLIP_SCRIPT = """
+const container = document.querySelector('.video-player-container');
+if (!container) return null;
+const video = container.querySelector('video');
+const videoInfo = Array.from(document.querySelectorAll('.overlay-video-info'))
+    .map(element => element.innerText.trim())
+    .find(text => text && text !== 'Download video');
+return {
+    videoURL: video ? video.getAttribute('src') : null,
+    subtitle: Array.from(container.querySelectorAll('.s-word')).map(element => element.innerText.trim()).join(' '),
+    videoInfo: videoInfo || 'N/A',
+    subtitleVersion: window.__scrapeBridge ? window.__scrapeBridge.subtitleVersion : 0
+};
+"""
+
+def drainPerformanceLog(driver):
+    """Return and discard the DevTools events logged since the last call"""
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        return []
+
+def pageBytes(driver):
+    """Bytes received over the network since the performance log was last drained"""
+    # Resource timing reports transferSize 0 for cross-origin responses, so the bytes come from the
+    # encodedDataLength of each DevTools Network.loadingFinished event instead
+    totalBytes = 0
+    for entry in drainPerformanceLog(driver):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") == "Network.loadingFinished":
+            totalBytes += message.get("params", {}).get("encodedDataLength", 0)
+    return totalBytes
+
+def waitForClip(driver, previous=None):
+    """Wait until the player shows a clip other than previous; returns it, or None on timeout"""
+    def clipChanged(driver):
+        clip = driver.execute_script(READ_CLIP_SCRIPT)
+        if not clip or not clip["videoURL"] or not clip["subtitle"]:
+            return False
+        if previous is None:
+            return clip
+        # The video src changes first; the clip is complete once its subtitle has rendered too
+        if clip["videoURL"] != previous["videoURL"] and (
+            clip["subtitle"] != previous["subtitle"] or clip["subtitleVersion"] > previous["subtitleVersion"]
+        ):
+            return clip
+        return False
+
+    try:
+        return WebDriverWait(driver, SCRAPE_WAIT_TIMEOUT, poll_frequency=SCRAPE_POLL_INTERVAL).until(clipChanged)
+    except TimeoutException:
+        return None
+
+def processWord(driver, word, record=recordEvent):
+    """Process a single word and collect its clips; returns the number of clips found"""
     print(f"🎯 Processing word: {word}")
     
-    if word not in data:
-        data[word] = {
-            "searched": False,
-            "clipsFound": 0,
-            "clipData": {}
-        }
+    # Results go through record, so parallel sessions can hand them to the single writer thread
+    clipData = {}
+    latencies = []
     
     try:
+        record(startEvent(word))
+        
+        # The tab is reused across words: after the first word only the search hash changes, so the clip
+        # still on screen is the one the next word's first clip has to replace
+        previous = driver.execute_script(READ_CLIP_SCRIPT)
+        if previous and not previous["videoURL"]:
+            previous = None
+        # The log is drained before each word and summed after it
+        drainPerformanceLog(driver)
+        
+        startTime = time.time()
         driver.get(f"https://www.playphrase.me/#/search?q={word}")
         
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "app")) and 
+        WebDriverWait(driver, SCRAPE_WAIT_TIMEOUT, poll_frequency=SCRAPE_POLL_INTERVAL).until(
             EC.presence_of_element_located((By.CLASS_NAME, "video-player-container"))
         )
+        driver.execute_script(INSTALL_OBSERVER_SCRIPT)
         
         actions = ActionChains(driver)
+        clip = waitForClip(driver, previous)
         
-        for pos in range(10):
-            print(f"  📹 Processing clip position {pos}")
+        # Clips that break the clip rules are skipped, so the player is stepped further until enough are usable
+        for pos in range(SCRAPE_MAX_POSITIONS):
+            if clip is None:
+                if pos == 0:
+                    print("    ⏹️  No clips shown for this word")
+                else:
+                    print("    ⏹️  No more clips available")
+                break
             
-            try:
-                sleep(2)
-                
-                currentUrl = driver.current_url
-                
-                element = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "video-player-container"))
-                )
-                
-                videoData = element.find_element(By.TAG_NAME, "video")
-                videoURL = videoData.get_attribute("src")
-
-                subtitleData = element.find_elements(By.CLASS_NAME, "s-word")
-                subtitle = " ".join([subtitle.text for subtitle in subtitleData])
-
-                videoInfoData = driver.find_elements(By.CLASS_NAME, "overlay-video-info")
-                videoInfo = "N/A"
-                for info in videoInfoData:
-                    if info.text.strip() != "Download video":
-                        videoInfo = info.text.strip()
-                        break
-
-                currentIndex = pos + 1
-                
-                data[word]["clipData"][str(currentIndex)] = {
-                    "videoURL": videoURL, 
-                    "subtitle": subtitle, 
-                    "videoInfo": videoInfo
-                }
-                
-                print(f"    ✅ Saved clip {currentIndex}")
-                
-                saveJsonData(data)
-                
-                if pos < 9:
-                    element.click()
-                    sleep(0.5)
+            latencies.append(time.time() - startTime)
+            
+            clipInfo = {
+                "videoURL": clip["videoURL"], 
+                "subtitle": clip["subtitle"], 
+                "videoInfo": clip["videoInfo"]
+            }
+            
+            reasons = clipFilter.rejections(clipInfo)
+            if reasons:
+                print(f"    ⏭️  Skipped clip at position {pos} ({', '.join(reasons)}, {latencies[-1]:.2f}s)")
+            else:
+                currentIndex = len(clipData) + 1
+                clipData[str(currentIndex)] = clipInfo
+                record(clipEvent(word, currentIndex, clipInfo))
+                print(f"    ✅ Saved clip {currentIndex} ({latencies[-1]:.2f}s)")
+                if len(clipData) >= CLIPS_PER_WORD:
+                    break
+            
+            if pos < SCRAPE_MAX_POSITIONS - 1:
+                try:
+                    startTime = time.time()
+                    driver.find_element(By.CLASS_NAME, "video-player-container").click()
                     actions.send_keys(Keys.ARROW_DOWN).perform()
-                    sleep(2)
-                    
-                    newUrl = driver.current_url
-                    if currentUrl == newUrl:
-                        print("    ⏹️  No more clips available")
-                        break
-                    
-                    try:
-                        newVideo = WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located((By.TAG_NAME, "video"))
-                        )
-                        newVideoUrl = newVideo.get_attribute("src")
-                        if newVideoUrl == videoURL:
-                            print("    ⏹️  End of available clips")
-                            break
-                    except Exception as e:
-                        print(f"    ⚠️  Could not verify new video: {e}")
-                        break
+                except Exception as e:
+                    print(f"    ❌ Error at position {pos}: {e}")
+                    break
                 
-            except Exception as e:
-                print(f"    ❌ Error at position {pos}: {e}")
-                break
+                # Times out when the player has no further clip to switch to
+                clip = waitForClip(driver, clip)
         
-        data[word]["searched"] = True
-        data[word]["clipsFound"] = len(data[word]["clipData"])
+        record(wordEvent(word, True, len(clipData)))
         
-        print(f"✅ Completed '{word}' - Found {data[word]['clipsFound']} clips")
-        return True
+        transferredKb = pageBytes(driver) / 1024
+        if latencies:
+            print(f"✅ Completed '{word}' - Found {len(clipData)} clips "
+                  f"({sum(latencies) / len(latencies):.2f}s mean, {max(latencies):.2f}s max per clip, "
+                  f"{transferredKb:.0f} KB downloaded)")
+        else:
+            print(f"✅ Completed '{word}' - Found 0 clips ({transferredKb:.0f} KB downloaded)")
+        return len(clipData)
         
     except Exception as e:
         print(error(f"❌ Error processing '{word}': {e}"))
-        return False
+        return 0
+
+def collectWithApi(word, record=recordEvent):
+    """Collect a word through the search API; returns the number of clips, or None to use the browser instead"""
+    if SCRAPE_COLLECTOR != "api":
+        return None
+    client = getPlayphraseClient()
+    if not client.available:
+        return None
+    
+    clipData = client.collect(word, clipFilter)
+    if clipData is None:
+        return None
+    
+    record(startEvent(word))
+    for clipIndex, clipInfo in clipData.items():
+        record(clipEvent(word, int(clipIndex), clipInfo))
+    record(wordEvent(word, True, len(clipData)))
+    
+    print(f"✅ Completed '{word}' via search API - Found {len(clipData)} clips")
+    return len(clipData)
+
+class BrowserSession:
+    """A scraper session's Chrome, started only when a word actually needs the browser"""
+    def __init__(self, sessionIndex):
+        self.sessionIndex = sessionIndex
+        self.port = int(DEBUGGING_PORT) + sessionIndex
+        self.chromeDriver = None
+        self.chromeProcess = None
+    
+    def driver(self):
+        if self.chromeDriver is None:
+            port, userDataDir = sessionProfile(self.sessionIndex)
+            self.chromeDriver, self.chromeProcess = startChromeSession(port, userDataDir)
+            self.chromeDriver.maximize_window()
+        return self.chromeDriver
+    
+    def close(self):
+        if self.chromeDriver or self.chromeProcess:
+            cleanupChrome(self.chromeDriver, self.chromeProcess, self.port)
 
 def getUnsearchedWords():
     """Get a list of words that haven't been searched yet"""
     return [word for word, wordData in data.items() if not wordData.get("searched", False)]
 
-def main():
-    driver = None
-    chromeProcess = None
-
-    try:
-        driver, chromeProcess = startChromeSession()
-        driver.maximize_window()
+def collectWords(browser, wordQueue, record=recordEvent, label=""):
+    """Scrape words from the shared queue until it is empty; returns the number of words processed"""
+    wordsProcessed = 0
+    consecutiveNoClips = 0
+    
+    while True:
+        try:
+            currentWord = wordQueue.get_nowait()
+        except queue.Empty:
+            break
         
-        driver.get("https://www.google.com")
-        sleep(2)
+        print(f"\n{'='*50}\n🔍 {label}Word #{wordsProcessed+1}: {currentWord}\n{'='*50}")
         
-        wordsProcessed = 0
-        consecutiveNoClips = 0
+        clipsFound = collectWithApi(currentWord, record)
+        if clipsFound is None:
+            clipsFound = processWord(browser.driver(), currentWord, record)
+        wordsProcessed += 1
         
+        if clipsFound == 0:
+            consecutiveNoClips += 1
+            print(warning(f"⚠️  {label}No clips found for {consecutiveNoClips} consecutive words"))
+            if consecutiveNoClips >= 5:
+                print(f"🛑 {label}Stopping: No clips found for {consecutiveNoClips} consecutive words")
+                break
+        else:
+            consecutiveNoClips = 0
+    
+    return wordsProcessed
+
+def runSession(sessionIndex, wordQueue, record=recordEvent, label=""):
+    """Run one Chrome session over the shared word queue; returns the number of words it processed"""
+    browser = BrowserSession(sessionIndex)
+    
+    try:
+        return collectWords(browser, wordQueue, record, label)
+    
+    except Exception as e:
+        print(error(f"❌ {label}Unhandled error: {e}"))
+        if not isinstance(e, ScrapeSessionError):
+            traceback.print_exc()
+        # Worker threads can't end the process, so the failure goes back to whoever started the session
+        raise ScrapeSessionError(f"{label}{e}") from e
+    
+    finally:
+        browser.close()
+
+def writeEvents(eventQueue):
+    """Single writer: the only thread that touches data and the journal while sessions run in parallel"""
+    while True:
+        event = eventQueue.get()
+        if event is None:
+            return
+        recordEvent(event)
+
+def collectParallel(wordQueue, sessions):
+    """Scrape the queued words with several Chrome sessions at once; returns the number of words processed"""
+    eventQueue = queue.Queue()
+    writer = threading.Thread(target=writeEvents, args=(eventQueue,), name="scrapeWriter", daemon=True)
+    writer.start()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            # Sessions start a second apart so their Chrome launches don't all hit the site at once
+            futures = []
+            for sessionIndex in range(sessions):
+                futures.append(executor.submit(
+                    runSession, sessionIndex, wordQueue, eventQueue.put, f"[session {sessionIndex}] "
+                ))
+                sleep(1)
+            
+            # A failed session only stops itself; the others keep taking words from the shared queue
+            wordsProcessed = 0
+            failures = []
+            for future in futures:
+                try:
+                    wordsProcessed += future.result()
+                except ScrapeSessionError as e:
+                    failures.append(str(e))
+    finally:
+        eventQueue.put(None)
+        writer.join()
+    
+    if len(failures) == sessions:
+        raise ScrapeSessionError(f"All {sessions} sessions failed: {'; '.join(failures)}")
+    if failures:
+        print(warning(f"⚠️  {len(failures)} of {sessions} sessions failed: {'; '.join(failures)}"))
+        print(warning("⚠️  Words a failed session had taken stay unsearched and are retried on the next run"))
+    return wordsProcessed
+
+def main():
+    sessionFailed = False
+    sessions = SCRAPE_SESSIONS
+    if "--sessions" in sys.argv:
+        sessions = max(1, int(sys.argv[sys.argv.index("--sessions") + 1]))
+
+    try:
         unsearchedWords = getUnsearchedWords()
         
         if not unsearchedWords:
@@ -247,39 +527,34 @@ def main():
             
         print(f"🎯 Found {len(unsearchedWords)} unsearched words")
         
-        for currentWord in unsearchedWords:
-            print(f"\n{'='*50}\n🔍 Word #{wordsProcessed+1}: {currentWord}\n{'='*50}")
-            
-            success = processWord(driver, currentWord)
-            wordsProcessed += 1
-            
-            saveJsonData(data)
-            
-            print(f"💾 Data saved for '{currentWord}'")
-            
-            if data[currentWord]["clipsFound"] == 0:
-                consecutiveNoClips += 1
-                print(warning(f"⚠️  No clips found for {consecutiveNoClips} consecutive words"))
-                if consecutiveNoClips >= 5:
-                    print(f"🛑 Stopping: No clips found for {consecutiveNoClips} consecutive words")
-                    break
-            else:
-                consecutiveNoClips = 0
-            
-            print("🔄 Resetting for next word...")
-            driver.get("https://www.google.com")
-            sleep(2)
+        wordQueue = queue.Queue()
+        for word in unsearchedWords:
+            wordQueue.put(word)
+        
+        sessions = min(sessions, len(unsearchedWords))
+        if SCRAPE_COLLECTOR == "api":
+            print(warning("⚠️  SCRAPE_COLLECTOR=api is experimental: words the search endpoint can't answer use the browser"))
+        if sessions > 1:
+            print(info(f"🧵 Scraping with {sessions} Chrome sessions"))
+            wordsProcessed = collectParallel(wordQueue, sessions)
+        else:
+            wordsProcessed = runSession(0, wordQueue)
             
         print(f"🎉 Script completed! Processed {wordsProcessed} words")
 
+    except ScrapeSessionError as e:
+        print(error(f"❌ Scraping stopped: {e}"))
+        sessionFailed = True
+
     except Exception as e:
         print(f"❌ Unhandled error: {e}")
         traceback.print_exc()
         
     finally:
         saveJsonData(data)
-        cleanupChrome(driver, chromeProcess)
+    
+    if sessionFailed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
-            
\ No newline at end of file
@@ -3,6 +3,43 @@ import os
 import sys
 from collections import defaultdict
 from utils import error, info, success
+from json_stream import iterJsonObject, writeJsonObject
+from clip_rules import clipRejections, subtitleWordCount, DUPLICATE_URL, SHORT_SUBTITLE, MIN_SUBTITLE_WORDS
+
+def cleanWordData(word, wordData, seenUrls=None):
+    """Remove the clips of one word entry that break the clip rules, in place; returns (duplicates, shortSubtitles, removed)"""
+    if "clipData" not in wordData:
+        return 0, 0, 0
+    
+    # A set shared across words dedupes URLs globally, like the scraper's ClipFilter; without one only within the word
+    if seenUrls is None:
+        seenUrls = set()
+    clipsToRemove = []
+    duplicateCount = 0
+    shortSubtitleCount = 0
+    
+    for clipId, clipInfo in wordData["clipData"].items():
+        # Same rules the scraper applies while collecting (clip_rules.py)
+        reasons = clipRejections(clipInfo, seenUrls)
+        
+        if DUPLICATE_URL in reasons:
+            duplicateCount += 1
+        
+        if SHORT_SUBTITLE in reasons:
+            shortSubtitleCount += 1
+            subtitle = clipInfo["subtitle"]
+            print(f"🗑️  Removing clip for '{word}' with short subtitle: '{subtitle}' ({subtitleWordCount(subtitle)} words)")
+        
+        if reasons:
+            clipsToRemove.append(clipId)
+    
+    for clipId in clipsToRemove:
+        del wordData["clipData"][clipId]
+    
+    if clipsToRemove:
+        wordData["clipsFound"] = len(wordData["clipData"])
+    
+    return duplicateCount, shortSubtitleCount, len(clipsToRemove)
 
 def cleanJson(inputFile=None, outputFile=None):
     if inputFile is None:
@@ -18,67 +55,40 @@ def cleanJson(inputFile=None, outputFile=None):
     
     print(info(f"📖 Reading JSON file: {inputFile}"))
     
-    try:
-        with open(inputFile, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(error(f"❌ Error parsing JSON: {e}"))
-        return False
-    except Exception as e:
-        print(error(f"❌ Error reading file: {e}"))
-        return False
-    
     wordCount = 0
     duplicateCount = 0
     shortSubtitleCount = 0
+    # Video URLs kept so far for any searched word; the first word in the file to use a URL keeps it
+    seenUrls = set()
     
-    for word, wordData in data.items():
-        if "clipData" not in wordData:
-            continue
-        
-        seenUrls = set()
-        clipsToRemove = []
+    def cleanedWords():
+        """Clean one word entry at a time as it is parsed, so memory use doesn't grow with the file"""
+        nonlocal wordCount, duplicateCount, shortSubtitleCount
         
-        for clipId, clipInfo in wordData["clipData"].items():
-            removeClip = False
-            
-            if "videoURL" in clipInfo:
-                videoUrl = clipInfo["videoURL"]
-                if videoUrl in seenUrls:
-                    removeClip = True
-                    duplicateCount += 1
-                else:
-                    seenUrls.add(videoUrl)
+        for word, wordData in iterJsonObject(inputFile):
+            # Unsearched words are scraped again from scratch, so like collectedUrls() they don't claim URLs
+            duplicates, shortSubtitles, removed = cleanWordData(word, wordData, seenUrls if wordData.get("searched") else None)
+            duplicateCount += duplicates
+            shortSubtitleCount += shortSubtitles
+            if removed:
+                wordCount += 1
             
-            if "subtitle" in clipInfo:
-                subtitle = clipInfo["subtitle"]
-                wordCountInSubtitle = len(subtitle.split())
-                if wordCountInSubtitle < 4:
-                    removeClip = True
-                    shortSubtitleCount += 1
-                    print(f"🗑️  Removing clip for '{word}' with short subtitle: '{subtitle}' ({wordCountInSubtitle} words)")
-            
-            if removeClip:
-                clipsToRemove.append(clipId)
-        
-        for clipId in clipsToRemove:
-            del wordData["clipData"][clipId]
-        
-        if clipsToRemove:
-            wordData["clipsFound"] = len(wordData["clipData"])
-            wordCount += 1
-    
-    print(f"🔄 Removed {duplicateCount} duplicate URLs across {wordCount} words")
-    print(f"🔄 Removed {shortSubtitleCount} clips with < 4 words in subtitle")
+            yield word, wordData
     
+    # The output is written while the input is still being read; it only replaces outputFile once complete
     try:
-        with open(outputFile, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        print(success(f"✅ Cleaned JSON saved to: {outputFile}"))
-        return True
+        writeJsonObject(outputFile, cleanedWords())
+    except json.JSONDecodeError as e:
+        print(error(f"❌ Error parsing JSON: {e}"))
+        return False
     except Exception as e:
-        print(error(f"❌ Error writing output file: {e}"))
+        print(error(f"❌ Error processing file: {e}"))
         return False
+    
+    print(f"🔄 Removed {duplicateCount} duplicate URLs across {wordCount} words")
+    print(f"🔄 Removed {shortSubtitleCount} clips with < {MIN_SUBTITLE_WORDS} words in subtitle")
+    print(success(f"✅ Cleaned JSON saved to: {outputFile}"))
+    return True
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
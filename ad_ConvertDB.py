@@ -1,16 +1,22 @@
 import json
+import sys
 import sqlite3
 import os
 import time
+import hashlib
 from datetime import datetime
 from utils import error, info, success
+from json_stream import iterJsonObject, writeJsonObject
 
 JSON_FILE = os.path.join("resources", "words_cleaned.json")
 DB_FILE = os.path.join("resources", "greWords.db")
 
-def createDatabase():
+# Changed words are written in batches of this size, so memory use doesn't grow with the JSON file
+IMPORT_BATCH_WORDS = 500
+
+def createDatabase(dbPath=DB_FILE):
     """Create the SQLite database with the required tables"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(dbPath)
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -21,7 +27,8 @@ def createDatabase():
         clips_found INTEGER DEFAULT 0,
         video_created BOOLEAN DEFAULT 0,
         video_uploaded BOOLEAN DEFAULT 0,
-        upload_time TEXT
+        upload_time TEXT,
+        source_hash TEXT
     )
     ''')
     
@@ -39,72 +46,191 @@ def createDatabase():
     )
     ''')
     
+    # Databases created before incremental imports lack the fingerprint column
+    wordColumns = [column[1] for column in cursor.execute('PRAGMA table_info(words)')]
+    if 'source_hash' not in wordColumns:
+        cursor.execute('ALTER TABLE words ADD COLUMN source_hash TEXT')
+    
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_word ON words(word)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_id ON clips(word_id)')
+    # Keep in sync with ELIGIBLE_WORDS in db_controller.py
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_words_eligible ON words(id) WHERE clips_found > 4 AND video_created = 0')
     
     conn.commit()
     return conn
 
 def loadJsonData():
-    """Load data from the JSON file"""
-    try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
-    except Exception as e:
-        print(error(f"❌ Error loading JSON data: {e}"))
-        return None
+    """Iterate over the (word, wordData) entries of the JSON file as they are parsed"""
+    return iterJsonObject(JSON_FILE)
+
+def applyLoadPragmas(conn):
+    """Trade durability for speed while importing; the import can simply be re-run if it is interrupted"""
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA cache_size = -65536')
+
+def restorePragmas(conn):
+    conn.execute('PRAGMA synchronous = NORMAL')
+
+def clipRowsFromJson(wordData):
+    """Return {clipIndex: (videoURL, subtitle, videoInfo, videoStartHeight)} for one word of the JSON file"""
+    return {
+        int(clipIndex): (
+            clipInfo.get('videoURL', ''),
+            clipInfo.get('subtitle', ''),
+            clipInfo.get('videoInfo', ''),
+            clipInfo.get('videoStartHeight', None)
+        )
+        for clipIndex, clipInfo in (wordData.get('clipData') or {}).items()
+    }
+
+def sourceHash(wordData):
+    """Fingerprint of everything the import writes for one word, used to skip unchanged words"""
+    # Hashing the raw fields is several times faster than building the clip rows for every word
+    digest = hashlib.sha1(f"{wordData.get('meaning', '')}\x1f{wordData.get('clipsFound', 0)}".encode('utf-8'))
+    for clipIndex, clipInfo in (wordData.get('clipData') or {}).items():
+        digest.update(
+            f"\x1e{clipIndex}\x1f{clipInfo.get('videoURL', '')}\x1f{clipInfo.get('subtitle', '')}"
+            f"\x1f{clipInfo.get('videoInfo', '')}\x1f{clipInfo.get('videoStartHeight')}".encode('utf-8')
+        )
+    return digest.hexdigest()
+
+def fetchClips(cursor, wordIds):
+    """Return {wordId: {clipIndex}} for the given words, querying in chunks below SQLite's variable limit"""
+    clipIndexes = {}
+    wordIds = list(wordIds)
+    for start in range(0, len(wordIds), 500):
+        chunk = wordIds[start:start + 500]
+        for wordId, clipIndex in cursor.execute(
+            f'SELECT word_id, clip_index FROM clips WHERE word_id IN ({", ".join("?" for _ in chunk)})', chunk
+        ):
+            clipIndexes.setdefault(wordId, set()).add(clipIndex)
+    return clipIndexes
+
+def syncWords(cursor, data, existingWords):
+    """Upsert the (word, wordData) pairs whose fingerprint differs from existingWords ({word: source_hash}); returns counts"""
+    # Works on an empty database as well as an existing one: words are upserted by name, so
+    # video_created, video_uploaded and upload_time are never touched, and words missing from the JSON are kept
+    counts = {"words": 0, "written": 0, "clips": 0, "staleClips": 0}
+    pending = []
+    
+    def writePending():
+        # Only the JSON-derived columns are updated; processing state stays as it is
+        cursor.executemany('''
+        INSERT INTO words (word, meaning, clips_found, source_hash)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(word) DO UPDATE SET
+            meaning = excluded.meaning,
+            clips_found = excluded.clips_found,
+            source_hash = excluded.source_hash
+        ''', [
+            (word, wordData.get('meaning', ''), wordData.get('clipsFound', 0), wordHash)
+            for word, wordData, wordHash in pending
+        ])
+        
+        words = [word for word, _, _ in pending]
+        wordIds = dict(cursor.execute(
+            f'SELECT word, id FROM words WHERE word IN ({", ".join("?" for _ in words)})', words
+        ).fetchall())
+        # Only words that were already in the database can have clips to remove
+        existingClips = fetchClips(cursor, (wordIds[word] for word in words if word in existingWords))
+        
+        clipRows = []
+        staleClips = []
+        for word, wordData, _ in pending:
+            wordId = wordIds[word]
+            jsonClips = clipRowsFromJson(wordData)
+            clipRows.extend((wordId, index, *clip) for index, clip in jsonClips.items())
+            staleClips.extend(
+                (wordId, index) for index in existingClips.get(wordId, ()) if index not in jsonClips
+            )
+        
+        cursor.executemany('DELETE FROM clips WHERE word_id = ? AND clip_index = ?', staleClips)
+        # Keep a computed layout height unless the JSON has one or the clip's text changed
+        cursor.executemany('''
+        INSERT INTO clips (word_id, clip_index, video_url, subtitle, video_info, video_start_height)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(word_id, clip_index) DO UPDATE SET
+            video_url = excluded.video_url,
+            subtitle = excluded.subtitle,
+            video_info = excluded.video_info,
+            video_start_height = COALESCE(
+                excluded.video_start_height,
+                CASE WHEN clips.subtitle = excluded.subtitle AND clips.video_info = excluded.video_info
+                     THEN clips.video_start_height END
+            )
+        ''', clipRows)
+        
+        counts["written"] += len(pending)
+        counts["clips"] += len(clipRows)
+        counts["staleClips"] += len(staleClips)
+        pending.clear()
+    
+    for word, wordData in data:
+        counts["words"] += 1
+        wordHash = sourceHash(wordData)
+        if existingWords.get(word) != wordHash:
+            pending.append((word, wordData, wordHash))
+            if len(pending) >= IMPORT_BATCH_WORDS:
+                writePending()
+    
+    if pending:
+        writePending()
+    
+    return counts
 
 def populateDatabase(conn, data):
-    """Populate the database with data from the JSON file"""
+    """Sync the database with (word, wordData) pairs in one transaction, writing only the words and clips that changed"""
     cursor = conn.cursor()
     
-    wordsCount = 0
-    clipsCount = 0
+    existingWords = dict(cursor.execute('SELECT word, source_hash FROM words').fetchall())
     
     try:
-        for word, wordData in data.items():
-            cursor.execute('''
-            INSERT INTO words (word, meaning, clips_found)
-            VALUES (?, ?, ?)
-            ''', (
-                word,
-                wordData.get('meaning', ''),
-                wordData.get('clipsFound', 0)
-            ))
-            
-            wordId = cursor.lastrowid
-            wordsCount += 1
-            
-            if 'clipData' in wordData and wordData['clipData']:
-                for clipIndex, clipInfo in wordData['clipData'].items():
-                    videoStartHeight = clipInfo.get('videoStartHeight', None)
-                    
-                    cursor.execute('''
-                    INSERT INTO clips (word_id, clip_index, video_url, subtitle, video_info, video_start_height)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        wordId,
-                        int(clipIndex),
-                        clipInfo.get('videoURL', ''),
-                        clipInfo.get('subtitle', ''),
-                        clipInfo.get('videoInfo', ''),
-                        videoStartHeight
-                    ))
-                    
-                    clipsCount += 1
-            
-            conn.commit()
-            
+        cursor.execute('BEGIN')
+        counts = syncWords(cursor, data, existingWords)
+        conn.commit()
     except Exception as e:
         print(error(f"❌ Error populating database: {e}"))
         conn.rollback()
         return False
     
     print(success("✅ Database populated successfully"))
-    print(info(f"📊 Imported {wordsCount} words and {clipsCount} clips"))
+    print(info(f"📊 {counts['words']} words in JSON: wrote {counts['written']} words and {counts['clips']} clips, removed {counts['staleClips']} stale clips"))
     return True
 
+def iterDatabaseWords(conn):
+    """Yield (word, wordData) pairs in the JSON file's shape from the database, one word at a time"""
+    rows = conn.execute('''
+    SELECT w.word, w.meaning, w.clips_found, c.clip_index, c.video_url, c.subtitle, c.video_info
+    FROM words w
+    LEFT JOIN clips c ON c.word_id = w.id
+    ORDER BY w.id, c.clip_index
+    ''')
+    
+    currentWord = None
+    wordData = None
+    for word, meaning, clipsFound, clipIndex, videoUrl, subtitle, videoInfo in rows:
+        if word != currentWord:
+            if currentWord is not None:
+                yield currentWord, wordData
+            currentWord = word
+            wordData = {"meaning": meaning, "clipsFound": clipsFound, "clipData": {}}
+        if clipIndex is not None:
+            wordData["clipData"][str(clipIndex)] = {"videoURL": videoUrl, "subtitle": subtitle, "videoInfo": videoInfo}
+    
+    if currentWord is not None:
+        yield currentWord, wordData
+
+def exportJson(outputFile=JSON_FILE, dbPath=DB_FILE):
+    """Dump the words and clips tables to a JSON file shaped like words_cleaned.json"""
+    conn = sqlite3.connect(dbPath)
+    try:
+        wordCount = writeJsonObject(outputFile, iterDatabaseWords(conn))
+    finally:
+        conn.close()
+    print(success(f"✅ Exported {wordCount} words from {dbPath} to {outputFile}"))
+
 def main():
     """Main function to convert JSON to SQLite"""
     startTime = time.time()
@@ -117,12 +243,12 @@ def main():
     
     conn = createDatabase()
     
+    # Rows are written while the JSON file is still being parsed
     data = loadJsonData()
-    if data is None:
-        conn.close()
-        return
     
+    applyLoadPragmas(conn)
     conversionSuccess = populateDatabase(conn, data)
+    restorePragmas(conn)
     
     conn.close()
     
@@ -135,4 +261,9 @@ def main():
         print(error("❌ Conversion failed"))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # The scraper upserts words as it goes; the JSON file is only needed as an on-demand dump
+    if "--export" in sys.argv:
+        exportArgs = sys.argv[sys.argv.index("--export") + 1:]
+        exportJson(exportArgs[0] if exportArgs else JSON_FILE)
+    else:
+        main() 
\ No newline at end of file
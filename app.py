@@ -1,14 +1,25 @@
 import os
+import sys
 import random
 import time
 import shutil
+import atexit
+import socket
 import logging
+import threading
 from datetime import datetime, timedelta
 
 # Import common utilities
 from utils import success, error, info, warning, highlight, importFromFile
-from config import pathStr, ensureDirsExist, IMAGES_DIR, DOWNLOADED_VIDEOS_DIR, MERGED_VIDEOS_DIR
+from config import (
+    pathStr, ensureDirsExist, RENDER_MODE,
+    PIPELINE_DOWNLOAD_WORKERS, PIPELINE_RENDER_WORKERS, PIPELINE_UPLOAD_WORKERS, PIPELINE_QUEUE_SIZE,
+    PREFETCH_NEXT_WORD, PREFETCH_RESERVATION_HOURS, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, WORKSPACE_STALE_HOURS
+)
 from db_controller import db
+from pipeline import Stage, Pipeline
+from workspace import Workspace, pruneStaleWorkspaces
+from word_job import loadWordJob
 
 # Set up logging
 log_file = "word_processing.log"
@@ -32,14 +43,21 @@ downloadWordVideos = downloadsModule.downloadWordVideos
 makeImagesForWord = imagesModule.makeImagesForWord
 processWord = addVideoModule.processWord
 createIntroOutroVideos = introOutroModule.createIntroOutroVideos
+createIntroOutroImages = introOutroModule.createIntroOutroImages
 mergeWordVideos = mergeModule.mergeWordVideos
+renderWordSinglePass = mergeModule.renderWordSinglePass
 uploadToInstagram = instagramUploadModule.uploadToInstagram
 uploadToYoutube = youtubeUploadModule.uploadToYoutube
 
-def selectRandomWord():
+# Identifies this process in word reservations and job leases
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+FIXED_CAPTION = """POV: You just unlocked a word that 99% still misuse  | If you're prepping for GRE, IELTS, or just wanna sound intellectually dangerous — SAVE THIS.  | Speak smarter, write sharper, and flex that vocab in style | Tag your study buddy | #GREprep #IELTSvocab #wordoftheday #englishwithstyle #speaklikeanative #studygram #vocabularyboost #learnenglish #englishreels #explorepage #IELTSpreparation #englishvocabulary #spokenenglish #studymotivation #englishlearning #dailyvocab #englishpractice #fluencygoals #vocabchallenge #englishtips #educationreels #englishgrammar #ieltsvocab #smartvocab"""
+
+def selectRandomWord(excludeWords=()):
     """Select a random word from the database that hasn't been processed yet"""
     try:
-        wordRow = db.getRandomWord()
+        wordRow = db.getRandomWord(excludeWords)
         
         if not wordRow:
             print(error("No eligible words found. All words have been processed or have no clips."))
@@ -53,138 +71,192 @@ def selectRandomWord():
         print(error(f"Error selecting random word: {e}"))
         return None
 
-def cleanupTempFiles(word):
-    """Clean up temporary files after processing is complete"""
+def cleanupTempFiles(word, workspace):
+    """Clean up the word's workspace after its final video is created"""
     print(info(f"\n--- Cleaning up temporary files for {word} ---"))
     
-    # Clean up all image files
-    imagesDir = pathStr(IMAGES_DIR)
-    imageCount = 0
-    
     try:
-        for filename in os.listdir(imagesDir):
-            # Delete all images in the directory
-            filePath = os.path.join(imagesDir, filename)
-            if os.path.isfile(filePath):
-                os.remove(filePath)
-                imageCount += 1
-        
-        print(info(f"Removed {imageCount} image files from images directory"))
+        removedCount = workspace.cleanup()
+        print(info(f"Removed {removedCount} files from workspace {workspace.path}"))
     except Exception as e:
-        print(error(f"Error cleaning up image files: {e}"))
+        print(error(f"Error cleaning up workspace {workspace.path}: {e}"))
     
-    # Clean up all downloaded videos
-    downloadDir = pathStr(DOWNLOADED_VIDEOS_DIR)
-    downloadCount = 0
+    print(success(f"Cleanup complete - temporary files for {word} removed"))
+
+def discardWorkspace(run):
+    """Remove a run's workspace however the run ended; a failed or dropped word must not stay on tmpfs"""
+    removedCount = run["workspace"].cleanup()
+    if removedCount:
+        logger.info(f"Removed {removedCount} leftover files of {run['word'].upper()} from {run['workspace'].path}")
+
+class WordPrefetcher:
+    """Reserve the next word and download its clips into its workspace while the current word renders"""
+    def __init__(self):
+        self.owner = WORKER_ID
+        self.word = None
+        self.thread = None
+        # Release on normal exit or Ctrl+C; if the process is killed the reservation simply expires
+        atexit.register(self.releaseAll)
     
-    try:
-        for filename in os.listdir(downloadDir):
-            filePath = os.path.join(downloadDir, filename)
-            if os.path.isfile(filePath):
-                os.remove(filePath)
-                downloadCount += 1
+    def start(self, currentWord):
+        """Reserve a word other than currentWord and start downloading its clips in the background"""
+        if self.thread:
+            return
         
-        print(info(f"Removed {downloadCount} video files from downloaded videos directory"))
-    except Exception as e:
-        print(error(f"Error cleaning up downloaded videos: {e}"))
+        wordRow = db.reserveRandomWord(self.owner, PREFETCH_RESERVATION_HOURS * 3600, (currentWord,))
+        if not wordRow:
+            return
+        
+        self.word = wordRow['word']
+        print(info(f"Prefetching clips for the next word: {self.word.upper()}"))
+        logger.info(f"Reserved {self.word.upper()} for prefetch as {self.owner}")
+        self.thread = threading.Thread(target=self._download, name=f"prefetch-{self.word}", daemon=True)
+        self.thread.start()
     
-    # Clean up all merged videos
-    mergedDir = pathStr(MERGED_VIDEOS_DIR)
-    mergedCount = 0
+    def _download(self):
+        try:
+            downloadWordVideos(self.word, workspace=Workspace(self.word))
+        except Exception as e:
+            print(warning(f"Prefetch of {self.word} failed: {e}"))
+            logger.warning(f"Prefetch of {self.word} failed: {e}")
     
-    try:
-        for filename in os.listdir(mergedDir):
-            filePath = os.path.join(mergedDir, filename)
-            if os.path.isfile(filePath):
-                os.remove(filePath)
-                mergedCount += 1
+    def take(self):
+        """Wait for the running prefetch and return its word, or None if nothing was prefetched"""
+        if not self.thread:
+            return None
         
-        print(info(f"Removed {mergedCount} video files from merged videos directory"))
-    except Exception as e:
-        print(error(f"Error cleaning up merged videos: {e}"))
+        self.thread.join()
+        word = self.word
+        self.word = None
+        self.thread = None
+        return word
+    
+    def release(self, wordId):
+        db.releaseReservations(self.owner, wordId)
     
-    print(success(f"Cleanup complete - all temporary files removed"))
+    def releaseAll(self):
+        db.releaseReservations(self.owner)
+        # A prefetch that was never taken leaves its downloaded clips behind
+        if self.word:
+            Workspace(self.word).cleanup()
 
-def processCompleteWord(word=None):
-    """Process a word through all scripts from start to finish"""
-    startTime = time.time()
+def startWordRun(word):
+    """Load a word from the database and create the state passed between stages"""
     start_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    if not word:
-        word = selectRandomWord()
-        if not word:
-            logger.error(f"No eligible words found to process")
-            return False
-    
     # Log process start
     logger.info(f"STARTED processing word: {word.upper()} at {start_datetime}")
     
-    # Get word data from database
-    wordRow = db.getWord(word)
-    if not wordRow:
+    # Load the word and its clips once; every stage works from this job
+    wordJob = loadWordJob(word)
+    if not wordJob:
         print(error(f"Word '{word}' not found in database"))
         logger.error(f"Word '{word}' not found in database")
-        return False
-    
-    wordId = wordRow['id']
+        return None
     
-    print(f"\n{info('='*60)}")
-    print(highlight(f"Starting complete processing for word: {word.upper()}"))
-    print(f"{info('='*60)}\n")
+    return {
+        "word": word,
+        "wordId": wordJob.id,
+        "meaning": wordJob.meaning,
+        "job": wordJob,
+        "workspace": Workspace(word).create(),
+        "startTime": time.time(),
+        "uploadSuccess": False
+    }
+
+def downloadStage(run):
+    """STEP 1: download the clips of a word"""
+    word = run["word"]
+    workspace = run["workspace"]
     
     print(highlight(f"\n--- STEP 1: Downloading videos for {word.upper()} ---"))
-    downloadResult = downloadWordVideos(word)
-    if not downloadResult or downloadResult.get("success", 0) + downloadResult.get("skipped", 0) == 0:
+    downloadResult = downloadWordVideos(word, workspace=workspace, wordJob=run["job"])
+    if not downloadResult or downloadResult.get("success", 0) + downloadResult.get("skipped", 0) + downloadResult.get("cached", 0) == 0:
         print(error(f"Failed to download any videos for {word}. Aborting."))
         logger.error(f"FAILED: Could not download any videos for {word}")
         return False
     
+    return True
+
+def renderStage(run):
+    """STEPS 2-5: images, intro/outro and the final video, then remove the intermediates"""
+    word = run["word"]
+    workspace = run["workspace"]
+    
     print(highlight(f"\n--- STEP 2: Generating images for {word.upper()} ---"))
-    imageResult = makeImagesForWord(word)
+    imageResult = makeImagesForWord(word, workspace, wordJob=run["job"])
     if not imageResult:
         print(error(f"Failed to create images for {word}. Aborting."))
         logger.error(f"FAILED: Could not create images for {word}")
         return False
     
-    print(highlight(f"\n--- STEP 3: Creating intro/outro images and videos for {word.upper()} ---"))
-    introOutroResult = createIntroOutroVideos(word)
-    if not introOutroResult:
-        print(error(f"Failed to create intro/outro elements. Aborting."))
-        logger.error(f"FAILED: Could not create intro/outro elements for {word}")
-        return False
+    if RENDER_MODE == "singlepass":
+        print(highlight(f"\n--- STEP 3: Creating intro/outro images for {word.upper()} ---"))
+        introOutroResult = createIntroOutroImages(word, workspace)
+        if not introOutroResult:
+            print(error(f"Failed to create intro/outro images. Aborting."))
+            logger.error(f"FAILED: Could not create intro/outro images for {word}")
+            return False
+        
+        print(highlight(f"\n--- STEP 4+5: Rendering final video in a single pass for {word.upper()} ---"))
+        finalResult = renderWordSinglePass(word, workspace=workspace, wordJob=run["job"])
+        if not finalResult:
+            print(error(f"Failed to render final video for {word}. Aborting."))
+            logger.error(f"FAILED: Could not render final video for {word}")
+            return False
+    else:
+        print(highlight(f"\n--- STEP 3: Creating intro/outro images and videos for {word.upper()} ---"))
+        introOutroResult = createIntroOutroVideos(word, workspace)
+        if not introOutroResult:
+            print(error(f"Failed to create intro/outro elements. Aborting."))
+            logger.error(f"FAILED: Could not create intro/outro elements for {word}")
+            return False
+        
+        print(highlight(f"\n--- STEP 4: Adding videos to images for {word.upper()} ---"))
+        mergeResult = processWord(word, workspace=workspace, wordJob=run["job"])
+        if not mergeResult:
+            print(error(f"Failed to add videos to images for {word}. Aborting."))
+            logger.error(f"FAILED: Could not add videos to images for {word}")
+            return False
+        
+        print(highlight(f"\n--- STEP 5: Creating final video for {word.upper()} ---"))
+        finalResult = mergeWordVideos(word, workspace=workspace, wordJob=run["job"])
+        if not finalResult:
+            print(error(f"Failed to create final video for {word}. Aborting."))
+            logger.error(f"FAILED: Could not create final video for {word}")
+            return False
     
-    print(highlight(f"\n--- STEP 4: Adding videos to images for {word.upper()} ---"))
-    mergeResult = processWord(word)
-    if not mergeResult:
-        print(error(f"Failed to add videos to images for {word}. Aborting."))
-        logger.error(f"FAILED: Could not add videos to images for {word}")
-        return False
+    # Clean up temporary files
+    cleanupTempFiles(word, workspace)
+    
+    return True
+
+def leaseLost(run):
+    """True once a job queue worker has lost the lease on this run's word to another worker"""
+    lostEvent = run.get("leaseLost")
+    return bool(lostEvent and lostEvent.is_set())
+
+def uploadStage(run):
+    """STEP 6: upload the final video and mark the word as processed"""
+    word = run["word"]
     
-    print(highlight(f"\n--- STEP 5: Creating final video for {word.upper()} ---"))
-    finalResult = mergeWordVideos(word)
-    if not finalResult:
-        print(error(f"Failed to create final video for {word}. Aborting."))
-        logger.error(f"FAILED: Could not create final video for {word}")
+    # Another worker may already be rendering this word; uploading it too would publish it twice
+    if leaseLost(run):
+        print(warning(f"Lost the lease on {word}; not uploading"))
         return False
     
     # Upload the final video to Instagram
     print(highlight(f"\n--- STEP 6: Uploading video to Instagram and YouTube for {word.upper()} ---"))
     
     # Get the meaning from the database
-    try:
-        meaning = wordRow['meaning'] if wordRow['meaning'] else ''
-    except (KeyError, TypeError):
-        meaning = ''
+    meaning = run["meaning"] or ''
     
     if not meaning:
         print(warning(f"No meaning found for {word} in database, using placeholder"))
         meaning = "a vocabulary word that enhances your English skills"
     
     # Create caption with meaning
-    fixed_caption = """POV: You just unlocked a word that 99% still misuse  | If you're prepping for GRE, IELTS, or just wanna sound intellectually dangerous — SAVE THIS.  | Speak smarter, write sharper, and flex that vocab in style | Tag your study buddy | #GREprep #IELTSvocab #wordoftheday #englishwithstyle #speaklikeanative #studygram #vocabularyboost #learnenglish #englishreels #explorepage #IELTSpreparation #englishvocabulary #spokenenglish #studymotivation #englishlearning #dailyvocab #englishpractice #fluencygoals #vocabchallenge #englishtips #educationreels #englishgrammar #ieltsvocab #smartvocab"""
-    caption = f"{word.upper()} means {meaning} ~ ~ ~ {fixed_caption}"
-    
-    uploadSuccess = False
+    caption = f"{word.upper()} means {meaning} ~ ~ ~ {FIXED_CAPTION}"
     
     try:
         # Upload to YouTube
@@ -193,17 +265,21 @@ def processCompleteWord(word=None):
         if youtubeResult:
             print(success(f"Successfully uploaded video for {word} to YouTube"))
             logger.info(f"Successfully uploaded video for {word} to YouTube")
-            uploadSuccess = True
+            run["uploadSuccess"] = True
         else:
             print(warning(f"Failed to upload video for {word} to YouTube"))
             logger.warning(f"Failed to upload video for {word} to YouTube")
 
+        if leaseLost(run):
+            print(warning(f"Lost the lease on {word}; not uploading to Instagram"))
+            return False
+        
         # Upload to Instagram
         print(highlight(f"\n--- Uploading to Instagram for {word.upper()} ---"))
         instagramResult = uploadToInstagram(word, caption)
         if instagramResult:
             print(success(f"Successfully uploaded video for {word} to Instagram"))
-            uploadSuccess = True
+            run["uploadSuccess"] = True
             logger.info(f"Successfully uploaded video for {word} to Instagram")
         else:
             print(warning(f"Failed to upload video for {word} to Instagram"))
@@ -216,15 +292,18 @@ def processCompleteWord(word=None):
     
     # Update database to mark word as processed
     completionTime = time.strftime("%Y-%m-%d %H:%M:%S")
-    db.markWordAsProcessed(wordId)
+    db.markWordAsProcessed(run["wordId"])
     print(success(f"Updated database: marked '{word}' as processed at {completionTime}"))
     logger.info(f"Updated database: marked '{word}' as processed at {completionTime}")
     
-    # Clean up temporary files
-    cleanupTempFiles(word)
+    return True
+
+def finishWordRun(run):
+    """Print and log the summary of a fully processed word"""
+    word = run["word"]
     
     endTime = time.time()
-    totalTime = endTime - startTime
+    totalTime = endTime - run["startTime"]
     minutes = int(totalTime // 60)
     seconds = int(totalTime % 60)
     
@@ -237,23 +316,206 @@ def processCompleteWord(word=None):
     end_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"FINISHED processing word: {word.upper()} at {end_datetime}")
     logger.info(f"Total processing time: {minutes} minutes {seconds} seconds")
-    logger.info(f"Overall status: {'SUCCESS' if uploadSuccess else 'PARTIAL SUCCESS (upload failed)'}")
+    logger.info(f"Overall status: {'SUCCESS' if run['uploadSuccess'] else 'PARTIAL SUCCESS (upload failed)'}")
     logger.info(f"{'-'*50}")
+
+def processCompleteWord(word=None, prefetcher=None):
+    """Process a word through all scripts from start to finish"""
+    if not word and prefetcher:
+        # The prefetched word's clips are already in its workspace, so step 1 only skips them
+        word = prefetcher.take()
+    if not word:
+        word = selectRandomWord()
+        if not word:
+            logger.error(f"No eligible words found to process")
+            return False
+    
+    run = startWordRun(word)
+    if not run:
+        # There is no word id without a run, but a taken prefetch is the only reservation held right now
+        if prefetcher:
+            prefetcher.releaseAll()
+        Workspace(word).cleanup()
+        return False
+    
+    print(f"\n{info('='*60)}")
+    print(highlight(f"Starting complete processing for word: {word.upper()}"))
+    print(f"{info('='*60)}\n")
+    
+    try:
+        for stage in (downloadStage, renderStage, uploadStage):
+            if not stage(run):
+                return False
+            if stage is downloadStage and prefetcher:
+                prefetcher.start(word)
+    finally:
+        # Processed words are no longer eligible; failed ones become eligible again
+        if prefetcher:
+            prefetcher.release(run["wordId"])
+        discardWorkspace(run)
     
+    finishWordRun(run)
     return True
 
+def runPipeline(maxWords=None):
+    """Process words concurrently: word N+1 downloads while word N renders and word N-1 uploads"""
+    seenWords = set()
+    
+    def onFail(run, stageName):
+        print(error(f"Pipeline: {run['word']} failed in the {stageName} stage"))
+        logger.error(f"FAILED: {run['word']} in pipeline stage {stageName}")
+        discardWorkspace(run)
+    
+    wordPipeline = Pipeline(
+        [
+            Stage("download", downloadStage, PIPELINE_DOWNLOAD_WORKERS, PIPELINE_QUEUE_SIZE),
+            Stage("render", renderStage, PIPELINE_RENDER_WORKERS, PIPELINE_QUEUE_SIZE),
+            Stage("upload", uploadStage, PIPELINE_UPLOAD_WORKERS, PIPELINE_QUEUE_SIZE)
+        ],
+        onDone=finishWordRun,
+        onFail=onFail
+    ).start()
+    
+    print(highlight("Starting pipelined word processing"))
+    submitted = 0
+    
+    try:
+        while maxWords is None or submitted < maxWords:
+            # Never hand the same word to the pipeline twice in one run
+            word = selectRandomWord(tuple(seenWords))
+            if not word:
+                break
+            seenWords.add(word)
+            
+            run = startWordRun(word)
+            if not run:
+                continue
+            
+            # Blocks while the download stage is saturated
+            wordPipeline.submit(run)
+            submitted += 1
+    finally:
+        wordPipeline.close()
+        wordPipeline.join()
+    
+    stats = wordPipeline.stats()
+    print(success(f"\nPipeline finished: {stats['completed']}/{submitted} words in {stats['elapsed'] / 60:.1f} minutes ({stats['wordsPerHour']:.2f} words/hour)"))
+    for stageName, stageStats in stats["stages"].items():
+        print(info(f"  {stageName}: {stageStats['processed']} ok, {stageStats['failed']} failed, busy {stageStats['busySeconds'] / 60:.1f} minutes"))
+    logger.info(f"Pipeline finished: {stats['completed']}/{submitted} words, {stats['wordsPerHour']:.2f} words/hour")
+    
+    return stats
+
+def keepLeaseAlive(jobId, stopEvent, lostEvent):
+    """Renew a job lease until stopEvent is set; sets lostEvent if the lease is lost (own database connection)"""
+    try:
+        while not stopEvent.wait(JOB_LEASE_SECONDS / 3):
+            if not db.heartbeatJob(jobId, WORKER_ID, JOB_LEASE_SECONDS):
+                lostEvent.set()
+                return
+    finally:
+        db.close()
+
+def runWorker(maxWords=None):
+    """Claim words from the shared job queue until none are left; any number of workers can share greWords.db"""
+    stages = {"download": downloadStage, "render": renderStage, "upload": uploadStage}
+    print(highlight(f"Starting job queue worker {WORKER_ID}"))
+    claimed = 0
+    completed = 0
+    
+    while maxWords is None or claimed < maxWords:
+        job = db.claimJob(WORKER_ID, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS)
+        if not job:
+            print(info("No claimable jobs left"))
+            break
+        claimed += 1
+        
+        word = job['word']
+        print(highlight(f"\nClaimed {word.upper()} (job {job['id']}, attempt {job['attempts']}/{JOB_MAX_ATTEMPTS})"))
+        logger.info(f"{WORKER_ID} claimed job {job['id']} for {word.upper()}, attempt {job['attempts']}")
+        
+        stopHeartbeat = threading.Event()
+        lostLease = threading.Event()
+        heartbeat = threading.Thread(target=keepLeaseAlive, args=(job['id'], stopHeartbeat, lostLease), daemon=True)
+        heartbeat.start()
+        
+        failure = None
+        run = None
+        try:
+            run = startWordRun(word)
+            if not run:
+                failure = "word not found"
+            else:
+                run["leaseLost"] = lostLease
+                for stageName, stage in stages.items():
+                    # Renew the lease right before each stage, so a lease that expired mid-render never reaches the upload
+                    if lostLease.is_set() or not db.heartbeatJob(job['id'], WORKER_ID, JOB_LEASE_SECONDS):
+                        lostLease.set()
+                        break
+                    if not stage(run):
+                        failure = f"{stageName} stage failed"
+                        break
+                    if not db.completeJob(job['id'], WORKER_ID, stageName):
+                        lostLease.set()
+                        break
+        except Exception as e:
+            failure = f"{type(e).__name__}: {e}"
+        finally:
+            stopHeartbeat.set()
+            heartbeat.join()
+            if run:
+                discardWorkspace(run)
+        
+        if lostLease.is_set():
+            # The job now belongs to another worker, so it is neither failed nor completed from here
+            print(warning(f"Lost the lease on job {job['id']} for {word}; stopped without uploading"))
+            logger.warning(f"{WORKER_ID} lost the lease on job {job['id']} for {word.upper()}; run stopped")
+        elif failure:
+            db.failJob(job['id'], WORKER_ID, failure, JOB_MAX_ATTEMPTS)
+            print(error(f"Job {job['id']} for {word} failed: {failure}"))
+            logger.error(f"FAILED: job {job['id']} for {word}: {failure}")
+        else:
+            completed += 1
+            finishWordRun(run)
+    
+    print(success(f"Worker {WORKER_ID} finished: {completed}/{claimed} claimed words completed"))
+    return completed
+
 if __name__ == "__main__":
     ensureDirsExist()
     
+    # Workspaces of runs that crashed or were killed are never cleaned up by the run itself
+    prunedCount = pruneStaleWorkspaces(WORKSPACE_STALE_HOURS * 3600)
+    if prunedCount:
+        print(info(f"Removed {prunedCount} stale workspaces"))
+        logger.info(f"Removed {prunedCount} stale workspaces at startup")
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "--pipeline":
+        maxWords = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        try:
+            runPipeline(maxWords)
+        except KeyboardInterrupt:
+            print(warning("\nPipeline interrupted by user. Exiting..."))
+        sys.exit(0)
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        maxWords = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        try:
+            runWorker(maxWords)
+        except KeyboardInterrupt:
+            print(warning("\nWorker interrupted by user. Exiting..."))
+        sys.exit(0)
+    
     try:
         print(highlight("Starting continuous word processing cycle"))
         print(info("Pattern: Process word -> Dynamic sleep to complete 12hr cycle -> Process word -> Repeat"))
+        prefetcher = WordPrefetcher() if PREFETCH_NEXT_WORD else None
         
         while True:
             # Process a word
             print(highlight("\n=== Processing word ==="))
             cycle_start_time = time.time()
-            processCompleteWord()
+            processCompleteWord(prefetcher=prefetcher)
             cycle_end_time = time.time()
             
             # Calculate processing time and dynamic sleep
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Asyncio download engine: one event loop streams every clip to disk under global limits
+"""
+import os
+import re
+import time
+import asyncio
+import threading
+import concurrent.futures
+from urllib.parse import urlsplit
+from config import (
+    DOWNLOAD_MAX_CONCURRENCY, DOWNLOAD_PER_HOST_LIMIT, DOWNLOAD_BANDWIDTH_KBPS,
+    DOWNLOAD_RETRIES, DOWNLOAD_RETRY_BACKOFF, DOWNLOAD_VERIFY
+)
+from clip_cache import clipCache
+from download_service import IncompleteDownload, handleUnsatisfiableRange
+from ffmpeg_runner import isValidVideo
+
+# aiohttp is only needed when DOWNLOAD_ENGINE=asyncio
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+CHUNK_SIZE = 64 * 1024
+
+class TokenBucket:
+    """Bandwidth limiter: consuming bytes waits until enough tokens have accumulated"""
+    def __init__(self, bytesPerSecond, capacity=None):
+        self.rate = bytesPerSecond
+        # Allow a burst of about one second of traffic, but never less than one chunk
+        self.capacity = capacity or max(bytesPerSecond, CHUNK_SIZE)
+        self.tokens = self.capacity
+        self.updatedAt = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def consume(self, amount):
+        if self.rate <= 0:
+            return
+
+        # The lock keeps waiters in order so one large transfer can't starve the others
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updatedAt) * self.rate)
+                self.updatedAt = now
+
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+class AsyncDownloadEngine:
+    def __init__(self, maxConcurrency=DOWNLOAD_MAX_CONCURRENCY, perHostLimit=DOWNLOAD_PER_HOST_LIMIT,
+                 bandwidthKbps=DOWNLOAD_BANDWIDTH_KBPS, verify=DOWNLOAD_VERIFY):
+        """Start the engine's event loop in a background thread"""
+        if aiohttp is None:
+            raise RuntimeError("DOWNLOAD_ENGINE=asyncio requires aiohttp (pip install -r requirements-async.txt)")
+
+        self.maxConcurrency = maxConcurrency
+        self.perHostLimit = perHostLimit
+        self.bandwidthBytes = bandwidthKbps * 1024
+        self.verify = verify
+
+        self.totalBytes = 0
+        self.totalClips = 0
+        self.activeTransfers = 0
+        self.activeSince = None
+        self.activeSeconds = 0.0
+
+        # All words share this loop, so the limits below hold across concurrent pipeline workers
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="async-download", daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self.loop).result()
+
+    async def _setup(self):
+        self.semaphore = asyncio.Semaphore(self.maxConcurrency)
+        self.hostSemaphores = {}
+        self.bucket = TokenBucket(self.bandwidthBytes)
+        connector = aiohttp.TCPConnector(limit=self.maxConcurrency, limit_per_host=self.perHostLimit)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=60)
+        )
+
+    def _hostSemaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.hostSemaphores:
+            self.hostSemaphores[host] = asyncio.Semaphore(self.perHostLimit)
+        return self.hostSemaphores[host]
+
+    def _transferStarted(self):
+        if self.activeTransfers == 0:
+            self.activeSince = time.time()
+        self.activeTransfers += 1
+
+    def _transferFinished(self):
+        self.activeTransfers -= 1
+        if self.activeTransfers == 0:
+            self.activeSeconds += time.time() - self.activeSince
+            self.activeSince = None
+
+    async def fetchToPart(self, videoUrl, partPath):
+        """Stream videoUrl into partPath, resuming with an HTTP Range request when possible"""
+        async with self.semaphore, self._hostSemaphore(videoUrl):
+            self._transferStarted()
+            try:
+                existingBytes = os.path.getsize(partPath) if os.path.exists(partPath) else 0
+                headers = {"Range": f"bytes={existingBytes}-"} if existingBytes else {}
+
+                async with self.session.get(videoUrl, headers=headers) as response:
+                    if response.status == 416:
+                        handleUnsatisfiableRange(partPath, existingBytes, response.headers.get("Content-Range"))
+                        return 0
+
+                    response.raise_for_status()
+
+                    if existingBytes and response.status == 206:
+                        match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+                        expectedBytes = int(match.group(1)) if match else None
+                        mode = "ab"
+                    else:
+                        expectedBytes = response.content_length
+                        existingBytes = 0
+                        mode = "wb"
+
+                    with open(partPath, mode) as videoFile:
+                        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                            await self.bucket.consume(len(chunk))
+                            videoFile.write(chunk)
+                            self.totalBytes += len(chunk)
+            finally:
+                self._transferFinished()
+
+        actualBytes = os.path.getsize(partPath)
+        if expectedBytes is not None and actualBytes != expectedBytes:
+            raise IncompleteDownload(f"Got {actualBytes} of {expectedBytes} bytes")
+
+        return actualBytes - existingBytes
+
+    async def downloadClip(self, word, clipIndex, videoUrl, filePath):
+        """Async counterpart of downloadClip in 1_downloadingVideos.py, returning the same result dict"""
+        partPath = f"{filePath}.part"
+
+        if os.path.exists(filePath):
+            return {"status": "skipped", "word": word, "clipIndex": clipIndex, "sizeMb": 0}
+
+        # Cache lookups, ffprobe and cache stores block, so they run off the event loop
+        if await asyncio.to_thread(clipCache.fetch, videoUrl, filePath):
+            return {"status": "cached", "word": word, "clipIndex": clipIndex, "sizeMb": 0}
+
+        lastError = None
+        downloadedBytes = 0
+
+        for attempt in range(DOWNLOAD_RETRIES):
+            if attempt:
+                await asyncio.sleep(DOWNLOAD_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+            try:
+                downloadedBytes += await self.fetchToPart(videoUrl, partPath)
+
+                if self.verify and not await asyncio.to_thread(isValidVideo, partPath):
+                    os.remove(partPath)
+                    raise IncompleteDownload("Downloaded file is not a readable video")
+
+                os.replace(partPath, filePath)
+                await asyncio.to_thread(clipCache.store, videoUrl, filePath)
+                self.totalClips += 1
+
+                return {
+                    "status": "success",
+                    "word": word,
+                    "clipIndex": clipIndex,
+                    "sizeMb": downloadedBytes / (1024 * 1024),
+                    "attempts": attempt + 1
+                }
+            except Exception as e:
+                lastError = e
+
+        return {
+            "status": "failed",
+            "word": word,
+            "clipIndex": clipIndex,
+            "error": str(lastError),
+            "sizeMb": downloadedBytes / (1024 * 1024),
+            "attempts": DOWNLOAD_RETRIES
+        }
+
+    def submit(self, word, clipIndex, videoUrl, filePath):
+        """Schedule a clip on the engine's loop from any thread; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(
+            self.downloadClip(word, clipIndex, videoUrl, filePath), self.loop
+        )
+
+    def downloadClips(self, tasks, onResult=None):
+        """Download (word, clipIndex, videoUrl, filePath) tasks and return their results as they finish"""
+        futures = [self.submit(*task) for task in tasks]
+        results = []
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if onResult:
+                onResult(result)
+        return results
+
+    def stats(self):
+        """Return aggregate throughput in the same shape as DownloadService.stats()"""
+        activeSeconds = self.activeSeconds
+        if self.activeSince is not None:
+            activeSeconds += time.time() - self.activeSince
+        totalMb = self.totalBytes / (1024 * 1024)
+        return {
+            "clips": self.totalClips,
+            "sizeMb": totalMb,
+            "activeSeconds": activeSeconds,
+            "mbPerSecond": totalMb / activeSeconds if activeSeconds > 0 else 0,
+            "clipsPerSecond": self.totalClips / activeSeconds if activeSeconds > 0 else 0
+        }
+
+    def shutdown(self):
+        asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+_engine = None
+_engineLock = threading.Lock()
+
+def getAsyncEngine():
+    """Return the process-wide asyncio download engine, creating it on first use"""
+    global _engine
+    with _engineLock:
+        if _engine is None:
+            _engine = AsyncDownloadEngine()
+        return _engine
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the threaded and asyncio download engines against a local server of synthetic MP4s
+Usage: python benchDownloads.py [--clips 60] [--size-kb 2048] [--latency-ms 50] [--bandwidth-kbps 0]
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import http.server
+
+# Synthetic clips aren't real videos and must always hit the network, so turn off ffprobe and the cache
+os.environ["DOWNLOAD_VERIFY"] = "0"
+os.environ["CLIP_CACHE_MAX_MB"] = "0"
+
+from workspace import Workspace
+from utils import success, error, info, highlight, importFromFile
+
+def makeSyntheticMp4(sizeBytes):
+    """An 'ftyp' box followed by filler bytes: looks like an MP4 to the downloader, never decoded"""
+    header = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+    filler = bytes(range(256)) * (sizeBytes // 256 + 1)
+    return (header + filler)[:sizeBytes]
+
+def startServer(payload, latencyMs):
+    """Serve the payload at any /clip/<n>.mp4 path with Range support and a fixed time-to-first-byte"""
+    class ClipHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latencyMs / 1000)
+            rangeHeader = self.headers.get("Range")
+            start = int(re.match(r"bytes=(\d+)-", rangeHeader).group(1)) if rangeHeader else 0
+            body = payload[start:]
+
+            self.send_response(206 if rangeHeader else 200)
+            if rangeHeader:
+                self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ClipHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def runEngine(name, downloadAll, tasks, sizeBytes):
+    start = time.time()
+    results = downloadAll(tasks)
+    elapsed = time.time() - start
+
+    completed = sum(1 for result in results if result["status"] == "success")
+    totalMb = completed * sizeBytes / (1024 * 1024)
+    print(f"{highlight(name.ljust(8))} {completed}/{len(tasks)} clips in {elapsed:.2f}s "
+          f"- {totalMb / elapsed:.1f} MB/s, {completed / elapsed:.1f} clips/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the threaded and asyncio download engines")
+    parser.add_argument("--clips", type=int, default=60)
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="asyncio engine cap (0 = unlimited)")
+    args = parser.parse_args()
+
+    downloadsModule = importFromFile("downloadingVideos", "1_downloadingVideos.py")
+    from download_service import getDownloadService
+    from async_downloader import AsyncDownloadEngine, aiohttp
+
+    if aiohttp is None:
+        print(error("aiohttp is not installed (pip install aiohttp)"))
+        sys.exit(1)
+
+    sizeBytes = args.size_kb * 1024
+    server = startServer(makeSyntheticMp4(sizeBytes), args.latency_ms)
+    baseUrl = f"http://127.0.0.1:{server.server_address[1]}"
+    benchRoot = tempfile.mkdtemp(prefix="benchDownloads-")
+
+    print(info(f"{args.clips} clips of {args.size_kb} KB, {args.latency_ms} ms time-to-first-byte"))
+
+    try:
+        # Each engine gets its own word so neither can skip clips the other already downloaded
+        threadWorkspace = Workspace("threads", root=benchRoot).create()
+        service = getDownloadService()
+
+        def downloadWithThreads(tasks):
+            futures = [
+                service.submit(downloadsModule.downloadClip, "threads", clipIndex, url, threadWorkspace)
+                for clipIndex, url in tasks
+            ]
+            return [future.result() for future in futures]
+
+        asyncWorkspace = Workspace("asyncio", root=benchRoot).create()
+        engine = AsyncDownloadEngine(bandwidthKbps=args.bandwidth_kbps)
+
+        def downloadWithAsyncio(tasks):
+            return engine.downloadClips([
+                ("asyncio", clipIndex, url, asyncWorkspace.downloadPath(clipIndex))
+                for clipIndex, url in tasks
+            ])
+
+        tasks = [(index, f"{baseUrl}/clip/{index}.mp4") for index in range(1, args.clips + 1)]
+        threadSeconds = runEngine("threads", downloadWithThreads, tasks, sizeBytes)
+        asyncSeconds = runEngine("asyncio", downloadWithAsyncio, tasks, sizeBytes)
+
+        print(success(f"asyncio / threads time ratio: {asyncSeconds / threadSeconds:.2f}"))
+        service.shutdown()
+        engine.shutdown()
+    finally:
+        server.shutdown()
+        shutil.rmtree(benchRoot, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
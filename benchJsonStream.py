@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of cleaning a word JSON file: json.load + json.dump versus the streaming reader/writer
+Usage: python benchJsonStream.py [sizes...]   (default: 10000 100000)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import resource
+import tempfile
+import subprocess
+from utils import info, success, highlight
+from json_stream import writeJsonObject
+
+CLIPS_PER_WORD = 10
+
+def syntheticWords(wordCount):
+    """Yield word entries shaped like greWords.json without ever holding the whole corpus"""
+    for index in range(wordCount):
+        yield f"word{index}", {
+            "searched": True,
+            "clipsFound": CLIPS_PER_WORD,
+            "clipData": {
+                str(clip): {
+                    "videoURL": f"https://s3.us-west-1.wasabisys.com/video/{index}_{clip}.mp4",
+                    "subtitle": f"an example subtitle that uses word{index} in a sentence",
+                    "videoInfo": f"Movie {index % 500} (2001)"
+                }
+                for clip in range(1, CLIPS_PER_WORD + 1)
+            }
+        }
+
+def runMode(mode, inputFile, outputFile):
+    """Clean inputFile into outputFile in this process and print the peak RSS in MB"""
+    startTime = time.time()
+    if mode == "load":
+        with open(inputFile, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        with open(outputFile, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+    else:
+        from ac_CleanJson import cleanJson
+        cleanJson(inputFile, outputFile)
+    elapsed = time.time() - startTime
+
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peakMb = peakRss / (1024 * 1024) if sys.platform == "darwin" else peakRss / 1024
+    print(json.dumps({"peakMb": peakMb, "elapsed": elapsed}))
+
+def measure(mode, inputFile, outputFile):
+    """Run one mode in a fresh interpreter so its peak RSS isn't mixed with the other's"""
+    output = subprocess.run(
+        [sys.executable, __file__, "--run", mode, inputFile, outputFile],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        runMode(*sys.argv[2:5])
+        return
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    benchDir = tempfile.mkdtemp(prefix="benchJsonStream-")
+
+    print(highlight(f"{'words':>8} {'file MB':>9} {'json.load peak':>18} {'streaming peak':>18}"))
+    try:
+        for wordCount in sizes:
+            inputFile = os.path.join(benchDir, f"words{wordCount}.json")
+            outputFile = os.path.join(benchDir, f"words{wordCount}_cleaned.json")
+            writeJsonObject(inputFile, syntheticWords(wordCount))
+            fileMb = os.path.getsize(inputFile) / (1024 * 1024)
+
+            loaded = measure("load", inputFile, outputFile)
+            streamed = measure("stream", inputFile, outputFile)
+            print(f"{wordCount:>8} {fileMb:>9.1f} "
+                  f"{loaded['peakMb']:>10.1f} MB {loaded['elapsed']:>3.0f}s "
+                  f"{streamed['peakMb']:>10.1f} MB {streamed['elapsed']:>3.0f}s")
+            os.remove(inputFile)
+            os.remove(outputFile)
+    finally:
+        shutil.rmtree(benchDir, ignore_errors=True)
+
+    print(info("Streaming peak RSS should stay flat as the word count grows"))
+    print(success("Done"))
+
+if __name__ == "__main__":
+    main()
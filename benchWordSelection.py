@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark random word selection: ORDER BY RANDOM() versus the indexed id probe in DBController
+Usage: python benchWordSelection.py [sizes...]   (default: 1000 100000 1000000)
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+from utils import info, success, highlight, importFromFile
+from db_controller import DBController
+
+convertModule = importFromFile("convertDB", "ad_ConvertDB.py")
+
+SELECTIONS = 200
+
+def buildDatabase(dbPath, wordCount):
+    """Create a words table of wordCount synthetic words, about a third of them already processed"""
+    conn = convertModule.createDatabase(dbPath)
+    rng = random.Random(wordCount)
+    conn.executemany(
+        "INSERT INTO words (word, meaning, clips_found, video_created) VALUES (?, ?, ?, ?)",
+        (
+            (f"word{index}", "meaning", rng.randint(0, 10), 1 if rng.random() < 0.33 else 0)
+            for index in range(wordCount)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+def timeSelection(selectWord):
+    """Return the mean latency of selectWord in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(SELECTIONS):
+        selectWord()
+    return (time.perf_counter() - start) / SELECTIONS * 1000
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+    benchDir = tempfile.mkdtemp(prefix="benchWordSelection-")
+
+    print(info(f"Mean latency over {SELECTIONS} selections"))
+    print(highlight(f"{'words':>10} {'ORDER BY RANDOM()':>20} {'id probe':>12} {'speedup':>10}"))
+
+    try:
+        for wordCount in sizes:
+            dbPath = os.path.join(benchDir, f"words{wordCount}.db")
+            buildDatabase(dbPath, wordCount)
+            controller = DBController(dbPath)
+
+            def orderByRandom():
+                return controller.conn.execute(
+                    "SELECT * FROM words WHERE clips_found > 4 AND video_created = 0 ORDER BY RANDOM() LIMIT 1"
+                ).fetchone()
+
+            sortMs = timeSelection(orderByRandom)
+            probeMs = timeSelection(controller.getRandomWord)
+            print(f"{wordCount:>10} {sortMs:>18.3f}ms {probeMs:>10.3f}ms {sortMs / probeMs:>9.0f}x")
+            controller.close()
+    finally:
+        shutil.rmtree(benchDir, ignore_errors=True)
+
+    print(success("Done"))
+
+if __name__ == "__main__":
+    main()
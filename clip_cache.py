@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Persistent, size-bounded cache of downloaded clips keyed by a hash of their URL
+"""
+import os
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from config import CLIP_CACHE_DIR, CLIP_CACHE_DB, CLIP_CACHE_MAX_MB, pathStr
+
+# fcntl is only available on POSIX; Windows falls back to hardlinks and copies
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request number for a copy-on-write clone on Linux (btrfs, xfs)
+FICLONE = 0x40049409
+
+def linkOrCopy(sourcePath, targetPath):
+    """Place a file at targetPath as a hardlink, a reflink or, failing both, a copy"""
+    if os.path.exists(targetPath):
+        os.remove(targetPath)
+
+    try:
+        os.link(sourcePath, targetPath)
+        return "hardlink"
+    except OSError:
+        pass
+
+    if fcntl:
+        try:
+            with open(sourcePath, 'rb') as source, open(targetPath, 'wb') as target:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            return "reflink"
+        except OSError:
+            pass
+
+    shutil.copyfile(sourcePath, targetPath)
+    return "copy"
+
+class ClipCache:
+    def __init__(self, cacheDir=CLIP_CACHE_DIR, indexPath=CLIP_CACHE_DB, maxMb=CLIP_CACHE_MAX_MB):
+        """Initialize the cache; a budget of 0 MB disables it"""
+        self.cacheDir = pathStr(cacheDir)
+        self.indexPath = pathStr(indexPath)
+        self.maxBytes = int(maxMb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.initialized = False
+
+    @property
+    def enabled(self):
+        return self.maxBytes > 0
+
+    @staticmethod
+    def keyFor(videoUrl):
+        return hashlib.sha256(videoUrl.encode('utf-8')).hexdigest()
+
+    def _cachePath(self, key):
+        return os.path.join(self.cacheDir, key[:2], f"{key}.mp4")
+
+    def _connect(self):
+        """Open the SQLite index (one short-lived connection per operation, safe across threads and processes)"""
+        conn = sqlite3.connect(self.indexPath, timeout=30)
+        if not self.initialized:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS clip_cache (
+                    url_hash TEXT PRIMARY KEY,
+                    video_url TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_clip_cache_access ON clip_cache(last_access)")
+            conn.commit()
+            self.initialized = True
+        return conn
+
+    def fetch(self, videoUrl, targetPath):
+        """Place the cached clip for a URL at targetPath; returns False on a cache miss"""
+        if not self.enabled:
+            return False
+
+        key = self.keyFor(videoUrl)
+        cachePath = self._cachePath(key)
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT size_bytes FROM clip_cache WHERE url_hash = ?", (key,)).fetchone()
+                if not row:
+                    return False
+
+                if not os.path.exists(cachePath) or os.path.getsize(cachePath) != row[0]:
+                    # The file vanished or was damaged behind our back: forget the entry
+                    conn.execute("DELETE FROM clip_cache WHERE url_hash = ?", (key,))
+                    conn.commit()
+                    return False
+
+                linkOrCopy(cachePath, targetPath)
+                conn.execute("UPDATE clip_cache SET last_access = ? WHERE url_hash = ?", (time.time(), key))
+                conn.commit()
+                return True
+            finally:
+                conn.close()
+
+    def store(self, videoUrl, sourcePath):
+        """Insert a downloaded clip into the cache atomically, then evict down to the budget"""
+        if not self.enabled:
+            return False
+
+        key = self.keyFor(videoUrl)
+        cachePath = self._cachePath(key)
+        tempPath = f"{cachePath}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(cachePath), exist_ok=True)
+            linkOrCopy(sourcePath, tempPath)
+            # Readers only ever see a complete file under the final name
+            os.replace(tempPath, cachePath)
+        except OSError:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            return False
+
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO clip_cache (url_hash, video_url, size_bytes, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (key, videoUrl, os.path.getsize(cachePath), now, now)
+                )
+                conn.commit()
+                self._evict(conn)
+            finally:
+                conn.close()
+        return True
+
+    def _evict(self, conn):
+        """Remove least recently used clips until the cache fits its disk budget"""
+        totalBytes = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM clip_cache").fetchone()[0]
+        if totalBytes <= self.maxBytes:
+            return
+
+        rows = conn.execute("SELECT url_hash, size_bytes FROM clip_cache ORDER BY last_access").fetchall()
+        for key, sizeBytes in rows:
+            if totalBytes <= self.maxBytes:
+                break
+            cachePath = self._cachePath(key)
+            if os.path.exists(cachePath):
+                os.remove(cachePath)
+            conn.execute("DELETE FROM clip_cache WHERE url_hash = ?", (key,))
+            totalBytes -= sizeBytes
+        conn.commit()
+
+    def stats(self):
+        """Return the number of cached clips and their total size in MB"""
+        with self.lock:
+            conn = self._connect()
+            try:
+                count, totalBytes = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM clip_cache"
+                ).fetchone()
+            finally:
+                conn.close()
+        return {"clips": count, "sizeMb": totalBytes / (1024 * 1024)}
+
+# Create a global instance for easy importing
+clipCache = ClipCache()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Rules deciding which scraped clips are usable, shared by the scraper and ac_CleanJson
+"""
+import threading
+
+# Usable clips the scraper collects per word
+CLIPS_PER_WORD = 10
+MIN_SUBTITLE_WORDS = 4
+
+DUPLICATE_URL = "duplicateUrl"
+SHORT_SUBTITLE = "shortSubtitle"
+
+def subtitleWordCount(subtitle):
+    return len(subtitle.split())
+
+def clipRejections(clipInfo, seenUrls):
+    """Return the rules clipInfo breaks (empty if it is usable); a new video URL is added to seenUrls"""
+    reasons = []
+
+    if "videoURL" in clipInfo:
+        videoUrl = clipInfo["videoURL"]
+        if videoUrl in seenUrls:
+            reasons.append(DUPLICATE_URL)
+        else:
+            seenUrls.add(videoUrl)
+
+    if "subtitle" in clipInfo and subtitleWordCount(clipInfo["subtitle"]) < MIN_SUBTITLE_WORDS:
+        reasons.append(SHORT_SUBTITLE)
+
+    return reasons
+
+def collectedUrls(data):
+    """Video URLs of every word that has been fully searched"""
+    # Words that weren't finished are collected again, so their clips must not count as duplicates
+    for wordData in data.values():
+        if wordData.get("searched"):
+            for clipInfo in wordData.get("clipData", {}).values():
+                if clipInfo.get("videoURL"):
+                    yield clipInfo["videoURL"]
+
+class ClipFilter:
+    """Applies the clip rules with one URL set shared by every word and scraper session"""
+    def __init__(self, seenUrls=()):
+        self.seenUrls = set(seenUrls)
+        self.lock = threading.Lock()
+
+    def rejections(self, clipInfo):
+        with self.lock:
+            return clipRejections(clipInfo, self.seenUrls)
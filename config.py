@@ -30,6 +30,9 @@ DATA_DIR = Path(getEnvVar('DATA_DIR', os.path.join(RESOURCES_DIR, 'data'))).reso
 
 # Data directory paths
 JSON_FILE = Path(getEnvVar('JSON_FILE', os.path.join(RESOURCES_DIR, 'greWords.json'))).resolve()
+# Scraper checkpoint journal: appended per clip, folded into JSON_FILE every JOURNAL_COMPACT_WORDS words
+JOURNAL_FILE = Path(getEnvVar('JOURNAL_FILE', os.path.join(RESOURCES_DIR, 'greWords.journal.jsonl'))).resolve()
+JOURNAL_COMPACT_WORDS = max(1, int(getEnvVar('JOURNAL_COMPACT_WORDS', '25')))
 SCR_CHROME_DATA_DIR = Path(getEnvVar('SCR_CHROME_DATA_DIR', os.path.join(RESOURCES_DIR, 'chromeData', 'scrapingChromeData'))).resolve()
 INS_CHROME_DATA_DIR = Path(getEnvVar('INS_CHROME_DATA_DIR', os.path.join(RESOURCES_DIR, 'chromeData', 'instagramChromeData'))).resolve()
 
@@ -38,6 +41,34 @@ IMAGES_DIR = Path(getEnvVar('IMAGES_DIR', os.path.join(DATA_DIR, 'images'))).res
 DOWNLOADED_VIDEOS_DIR = Path(getEnvVar('DOWNLOADED_VIDEOS_DIR', os.path.join(DATA_DIR, 'downloadedVideos'))).resolve()
 MERGED_VIDEOS_DIR = Path(getEnvVar('MERGED_VIDEOS_DIR', os.path.join(DATA_DIR, 'mergedVideos'))).resolve()
 FINAL_VIDEOS_DIR = Path(getEnvVar('FINAL_VIDEOS_DIR', os.path.join(DATA_DIR, 'finalVideos'))).resolve()
+# Each word is processed in its own subdirectory; point this at tmpfs (e.g. /dev/shm/greWords) to keep intermediates in RAM
+WORKSPACES_DIR = Path(getEnvVar('WORKSPACES_DIR', os.path.join(DATA_DIR, 'workspaces'))).resolve()
+# Workspaces untouched for this long are left over from a crash or kill and are removed when app.py starts
+WORKSPACE_STALE_HOURS = float(getEnvVar('WORKSPACE_STALE_HOURS', '24'))
+
+# Downloaded clip cache (index lives next to greWords.db); a budget of 0 MB disables it
+CLIP_CACHE_DIR = Path(getEnvVar('CLIP_CACHE_DIR', os.path.join(DATA_DIR, 'clipCache'))).resolve()
+CLIP_CACHE_DB = Path(getEnvVar('CLIP_CACHE_DB', os.path.join(RESOURCES_DIR, 'clipCache.db'))).resolve()
+CLIP_CACHE_MAX_MB = float(getEnvVar('CLIP_CACHE_MAX_MB', '2048'))
+
+# Shared download service: concurrent clip downloads across all words, and at most this many per host
+DOWNLOAD_WORKERS = max(1, int(getEnvVar('DOWNLOAD_WORKERS', '8')))
+DOWNLOAD_PER_HOST_LIMIT = max(1, int(getEnvVar('DOWNLOAD_PER_HOST_LIMIT', '6')))
+
+# Download retries per clip; the wait doubles after each failed attempt
+DOWNLOAD_RETRIES = max(1, int(getEnvVar('DOWNLOAD_RETRIES', '3')))
+DOWNLOAD_RETRY_BACKOFF = float(getEnvVar('DOWNLOAD_RETRY_BACKOFF', '2'))
+# Check each finished clip with ffprobe before it is moved into place
+DOWNLOAD_VERIFY = getEnvVar('DOWNLOAD_VERIFY', '1') != '0'
+
+# Download engine: 'threads' (shared executor) or 'asyncio' (single event loop, needs aiohttp)
+DOWNLOAD_ENGINE = getEnvVar('DOWNLOAD_ENGINE', 'threads').lower()
+# asyncio engine: concurrent transfers across all words, and a total bandwidth cap in KB/s (0 = unlimited)
+DOWNLOAD_MAX_CONCURRENCY = max(1, int(getEnvVar('DOWNLOAD_MAX_CONCURRENCY', '8')))
+DOWNLOAD_BANDWIDTH_KBPS = max(0, int(getEnvVar('DOWNLOAD_BANDWIDTH_KBPS', '0')))
+
+# How long a database connection waits for another writer before raising "database is locked"
+DB_BUSY_TIMEOUT_MS = max(0, int(getEnvVar('DB_BUSY_TIMEOUT_MS', '30000')))
 
 # Resource files
 BACKGROUND_IMAGE = Path(getEnvVar('BACKGROUND_IMAGE', os.path.join(RESOURCES_DIR, 'woKyaBolRahi.png'))).resolve()
@@ -57,8 +88,47 @@ PDF_FILE = Path(getEnvVar('PDF_FILE', os.path.join(RESOURCES_DIR, 'wordList.pdf'
 # Chrome Configuration
 DEBUGGING_PORT = getEnvVar('DEBUGGING_PORT', '9004')
 CHROME_PATH = getEnvVar('CHROME_PATH', None)
+# Parallel scraper sessions: session i uses port DEBUGGING_PORT + i and a copy of SCR_CHROME_DATA_DIR
+SCRAPE_SESSIONS = max(1, int(getEnvVar('SCRAPE_SESSIONS', '1')))
+# Longest the scraper waits for a page or the next clip to appear, and how often it checks, in seconds
+SCRAPE_WAIT_TIMEOUT = float(getEnvVar('SCRAPE_WAIT_TIMEOUT', '10'))
+SCRAPE_POLL_INTERVAL = float(getEnvVar('SCRAPE_POLL_INTERVAL', '0.1'))
+# Most clip positions the scraper looks at per word while looking for usable clips (see clip_rules.py)
+SCRAPE_MAX_POSITIONS = max(1, int(getEnvVar('SCRAPE_MAX_POSITIONS', '30')))
+# Clean and upsert each finished word into greWords.db while scraping, instead of a later ac_CleanJson + ad_ConvertDB pass
+SCRAPE_INGEST_DB = getEnvVar('SCRAPE_INGEST_DB', '1') != '0'
+# Block video, image and font requests in the scraper's Chrome; only the DOM is read
+SCRAPE_BLOCK_RESOURCES = getEnvVar('SCRAPE_BLOCK_RESOURCES', '1') != '0'
+# "browser" drives Chrome; "api" reads clips from the playphrase search endpoint and falls back to Chrome
+# (neither the endpoint URL nor its response schema is confirmed by a recorded response, so "api" stays opt-in)
+SCRAPE_COLLECTOR = getEnvVar('SCRAPE_COLLECTOR', 'browser').lower()
+PLAYPHRASE_API_URL = getEnvVar('PLAYPHRASE_API_URL', 'https://www.playphrase.me/api/v1/phrases/search')
+PLAYPHRASE_API_TOKEN = getEnvVar('PLAYPHRASE_API_TOKEN', None)
+# Consecutive search failures after which the rest of the run uses the browser
+PLAYPHRASE_API_MAX_FAILURES = max(1, int(getEnvVar('PLAYPHRASE_API_MAX_FAILURES', '3')))
 YOUTUBE_CHANNEL_ID = getEnvVar('YOUTUBE_CHANNEL_ID', None)
 
+# Rendering Configuration
+# "multipass" encodes every clip, then concatenates; "singlepass" builds one filter graph per word
+RENDER_MODE = getEnvVar('RENDER_MODE', 'multipass').lower()
+# Number of clips encoded at once by 3_addVideoToImage.py; the CPU cores are split between them
+CLIP_ENCODE_WORKERS = max(1, int(getEnvVar('CLIP_ENCODE_WORKERS', '1')))
+
+# Pipeline Configuration (python app.py --pipeline): workers per stage and queue size between stages
+PIPELINE_DOWNLOAD_WORKERS = max(1, int(getEnvVar('PIPELINE_DOWNLOAD_WORKERS', '1')))
+PIPELINE_RENDER_WORKERS = max(1, int(getEnvVar('PIPELINE_RENDER_WORKERS', '1')))
+PIPELINE_UPLOAD_WORKERS = max(1, int(getEnvVar('PIPELINE_UPLOAD_WORKERS', '1')))
+PIPELINE_QUEUE_SIZE = max(1, int(getEnvVar('PIPELINE_QUEUE_SIZE', '1')))
+
+# Prefetch (python app.py): download the next word's clips while the current word renders
+PREFETCH_NEXT_WORD = getEnvVar('PREFETCH_NEXT_WORD', '0') == '1'
+# A reservation must outlive the 12-hour cycle; it expires on its own if the process is killed
+PREFETCH_RESERVATION_HOURS = float(getEnvVar('PREFETCH_RESERVATION_HOURS', '24'))
+
+# Job queue workers (python app.py --worker): lease length (renewed every third of it) and attempts per word
+JOB_LEASE_SECONDS = max(30, int(getEnvVar('JOB_LEASE_SECONDS', '1800')))
+JOB_MAX_ATTEMPTS = max(1, int(getEnvVar('JOB_MAX_ATTEMPTS', '3')))
+
 # List of all directories that need to be created
 ALL_DIRECTORIES = [
     RESOURCES_DIR,
@@ -68,6 +138,8 @@ ALL_DIRECTORIES = [
     DOWNLOADED_VIDEOS_DIR,
     MERGED_VIDEOS_DIR,
     FINAL_VIDEOS_DIR,
+    WORKSPACES_DIR,
+    CLIP_CACHE_DIR,
     os.path.join(RESOURCES_DIR, 'chromeData')
 ]
 
@@ -2,30 +2,193 @@ import os
 import sqlite3
 import random
 import time
+import threading
+import contextlib
 from datetime import datetime
-from config import ensureDirsExist
+from config import DB_BUSY_TIMEOUT_MS, ensureDirsExist
 
 DB_FILE = os.path.join("resources", "greWords.db")
 
+# Words that can still be turned into a video; idx_words_eligible covers exactly these rows
+ELIGIBLE_WORDS = "clips_found > 4 AND video_created = 0"
+
+# Id probes tried before random word selection falls back to a random offset among the matching words
+RANDOM_PROBE_ATTEMPTS = 8
+
+# Stages a job moves through, in order; a job whose last stage completes is 'done'
+JOB_STAGES = ("download", "render", "upload")
+
+class WriteBatch:
+    """Unit of work: queue writes, then apply them with executemany in a single transaction"""
+    def __init__(self, controller):
+        self.controller = controller
+        # (statement, parameter rows) runs in submission order; only consecutive repeats of a statement share
+        # a run, so interleaved writes (e.g. set then reset the same row) are applied in the order queued
+        self.statements = []
+    
+    def add(self, sql, params):
+        """Queue one execution of sql with params"""
+        if self.statements and self.statements[-1][0] == sql:
+            self.statements[-1][1].append(tuple(params))
+        else:
+            self.statements.append((sql, [tuple(params)]))
+        return self
+    
+    def updateClipVideoStartHeight(self, wordId, clipIndex, videoStartHeight):
+        return self.add(
+            "UPDATE clips SET video_start_height = ? WHERE word_id = ? AND clip_index = ?",
+            (videoStartHeight, wordId, clipIndex)
+        )
+    
+    def markWordAsProcessed(self, wordId):
+        return self.add("UPDATE words SET video_created = 1 WHERE id = ?", (wordId,))
+    
+    def markWordAsUploaded(self, wordId, uploadTime):
+        return self.add("UPDATE words SET video_uploaded = 1, upload_time = ? WHERE id = ?", (uploadTime, wordId))
+    
+    def __len__(self):
+        return sum(len(rows) for _, rows in self.statements)
+    
+    def commit(self):
+        """Apply every queued write in one transaction (one fsync) and return the number of rows changed"""
+        if not self.statements:
+            return 0
+        
+        conn = self.controller.conn
+        self.controller._beginImmediate()
+        try:
+            changed = 0
+            for sql, rows in self.statements:
+                changed += conn.executemany(sql, rows).rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        self.statements = []
+        return changed
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excVal, excTb):
+        """Commit on success; an exception discards the queued writes"""
+        if excType is None:
+            self.commit()
+        else:
+            self.statements = []
+
 class DBController:
-    def __init__(self, dbPath=DB_FILE):
-        """Initialize database controller with database path"""
+    def __init__(self, dbPath=DB_FILE, readOnly=False):
+        """Initialize database controller with database path; nothing is opened until first use"""
         self.dbPath = dbPath
-        ensureDirsExist()
-        self._createConnection()
+        self.readOnly = readOnly
+        # One connection per thread, so pipeline stages, prefetch and heartbeat threads never share a transaction
+        self.local = threading.local()
+        self.schemaLock = threading.Lock()
+        self.schemaReady = False
+    
+    @property
+    def conn(self):
+        """The calling thread's connection, created on first use"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self._createConnection()
+            self.local.conn = conn
+        return conn
     
     def _createConnection(self):
-        """Create a database connection"""
-        self.conn = sqlite3.connect(self.dbPath)
+        """Create a database connection for the calling thread"""
+        if self.readOnly:
+            # mode=ro makes any write fail instead of silently taking the write lock
+            conn = sqlite3.connect(f"file:{self.dbPath}?mode=ro", uri=True, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        else:
+            ensureDirsExist()
+            conn = sqlite3.connect(self.dbPath, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        
+        # Wait for a competing writer instead of failing with "database is locked"
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
         # Enable foreign keys
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self.readOnly:
+            # WAL lets readers continue while a batch is written; NORMAL syncs only at checkpoints in WAL mode
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
         # Return Row objects rather than tuples
-        self.conn.row_factory = sqlite3.Row
+        conn.row_factory = sqlite3.Row
+        
+        if not self.readOnly:
+            with self.schemaLock:
+                if not self.schemaReady:
+                    self._ensureSchema(conn)
+                    self.schemaReady = True
+        return conn
+    
+    def _ensureSchema(self, conn):
+        """Create the bookkeeping tables this controller owns (words/clips come from ad_ConvertDB.py)"""
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS word_reservations (
+                word_id INTEGER PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                FOREIGN KEY (word_id) REFERENCES words(id)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word_id INTEGER NOT NULL UNIQUE,
+                stage TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at REAL NOT NULL,
+                FOREIGN KEY (word_id) REFERENCES words(id)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires_at)")
+        
+        # Partial index over eligible word ids, so random selection is an index seek instead of scan + sort
+        hasWords = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words'"
+        ).fetchone()
+        if hasWords:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_words_eligible ON words(id) WHERE {ELIGIBLE_WORDS}")
+        conn.commit()
+    
+    def _beginImmediate(self):
+        """Start a write transaction that holds the database write lock from its first statement"""
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+    
+    @contextlib.contextmanager
+    def immediateTransaction(self):
+        """Run a block in one write transaction: `with db.immediateTransaction() as conn:` commits, or rolls back on error"""
+        self._beginImmediate()
+        try:
+            yield self.conn
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def writeBatch(self):
+        """Start a unit of work; use as `with db.writeBatch() as batch:` to commit once at the end"""
+        return WriteBatch(self)
     
     def close(self):
-        """Close the database connection"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        """Close the calling thread's connection (other threads' connections close when their thread ends)"""
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
     
     def __enter__(self):
         """Context manager entry"""
@@ -45,6 +208,23 @@ class DBController:
         )
         return cursor.fetchone()
     
+    def getWordWithClips(self, word):
+        """Get a word's row joined with each of its clips in one query (a single row with NULL clip columns if it has none)"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT w.id AS word_id, w.word, w.meaning, w.clips_found, w.video_created,
+                   w.video_uploaded, w.upload_time,
+                   c.id AS clip_id, c.clip_index, c.video_url, c.subtitle, c.video_info, c.video_start_height
+            FROM words w
+            LEFT JOIN clips c ON c.word_id = w.id
+            WHERE w.word = ?
+            ORDER BY c.clip_index
+            """,
+            (word,)
+        )
+        return cursor.fetchall()
+    
     def getWordById(self, wordId):
         """Get a word's data by ID"""
         cursor = self.conn.cursor()
@@ -54,19 +234,224 @@ class DBController:
         )
         return cursor.fetchone()
     
-    def getRandomWord(self):
-        """Select a random word that hasn't been processed yet"""
+    def _randomEligibleWord(self, conditions=(), params=()):
+        """Pick a uniformly random eligible word matching the extra SQL conditions, usually with O(log n) id probes"""
+        # Separate subqueries, because SQLite only seeks to the end of the index for a lone MIN() or MAX()
+        lowId, highId = self.conn.execute(
+            f"""
+            SELECT (SELECT MIN(id) FROM words WHERE {ELIGIBLE_WORDS}),
+                   (SELECT MAX(id) FROM words WHERE {ELIGIBLE_WORDS})
+            """
+        ).fetchone()
+        if lowId is None:
+            return None
+        
+        extraClause = "".join(f" AND {condition}" for condition in conditions)
+        
+        # A probe only counts if it lands exactly on a matching id, so every matching word is equally likely.
+        # Taking the next id after a miss instead would favour words that follow a run of processed ones.
+        for _ in range(RANDOM_PROBE_ATTEMPTS):
+            wordRow = self.conn.execute(
+                f"SELECT * FROM words WHERE {ELIGIBLE_WORDS} AND id = ?{extraClause}",
+                (random.randint(lowId, highId), *params)
+            ).fetchone()
+            if wordRow:
+                return wordRow
+        
+        # Few ids in the range still match, so pick a random offset among them; the partial index keeps this
+        # scan as short as the number of eligible words
+        matchCount = self.conn.execute(
+            f"SELECT COUNT(*) FROM words WHERE {ELIGIBLE_WORDS}{extraClause}", tuple(params)
+        ).fetchone()[0]
+        if not matchCount:
+            return None
+        return self.conn.execute(
+            f"SELECT * FROM words WHERE {ELIGIBLE_WORDS}{extraClause} ORDER BY id LIMIT 1 OFFSET ?",
+            (*params, random.randrange(matchCount))
+        ).fetchone()
+    
+    def _tableExists(self, name):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+    
+    def getRandomWord(self, excludeWords=()):
+        """Select a random word that hasn't been processed or reserved yet, skipping any in excludeWords"""
+        now = time.time()
+        conditions = []
+        params = []
+        # A read-only controller never creates the bookkeeping tables, so a database from before them may lack
+        # them; with no table there is nothing reserved or leased to skip
+        if self._tableExists("word_reservations"):
+            conditions.append("NOT EXISTS (SELECT 1 FROM word_reservations r WHERE r.word_id = words.id AND r.expires_at > ?)")
+            params.append(now)
+        if self._tableExists("jobs"):
+            conditions.append("NOT EXISTS (SELECT 1 FROM jobs j WHERE j.word_id = words.id AND j.status = 'running' AND j.lease_expires_at > ?)")
+            params.append(now)
+        if excludeWords:
+            conditions.append(f"word NOT IN ({', '.join('?' for _ in excludeWords)})")
+            params.extend(excludeWords)
+        
+        return self._randomEligibleWord(conditions, params)
+    
+    def reserveRandomWord(self, owner, ttlSeconds, excludeWords=()):
+        """Atomically pick a random eligible word and reserve it for owner until the TTL runs out"""
+        # BEGIN IMMEDIATE takes the write lock up front, so two processes can't reserve the same word
+        self._beginImmediate()
+        try:
+            self.conn.execute("DELETE FROM word_reservations WHERE expires_at <= ?", (time.time(),))
+            wordRow = self.getRandomWord(excludeWords)
+            if wordRow:
+                self.conn.execute(
+                    "INSERT INTO word_reservations (word_id, owner, expires_at) VALUES (?, ?, ?)",
+                    (wordRow['id'], owner, time.time() + ttlSeconds)
+                )
+            self.conn.commit()
+            return wordRow
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def releaseReservations(self, owner, wordId=None):
+        """Release one of owner's word reservations, or all of them when wordId is None"""
+        cursor = self.conn.cursor()
+        if wordId is None:
+            cursor.execute("DELETE FROM word_reservations WHERE owner = ?", (owner,))
+        else:
+            cursor.execute("DELETE FROM word_reservations WHERE owner = ? AND word_id = ?", (owner, wordId))
+        self.conn.commit()
+        return cursor.rowcount
+    
+    # Job queue functions: every claim and state change is one BEGIN IMMEDIATE transaction
+    def claimJob(self, owner, leaseSeconds, maxAttempts=3):
+        """Lease the next job to owner, creating one for a random eligible word if none is waiting"""
+        now = time.time()
+        self._beginImmediate()
+        try:
+            # Jobs whose worker died after their last allowed attempt will never be retried
+            self.conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE status = 'running' AND lease_expires_at <= ? AND attempts >= ?
+                """,
+                (now, now, maxAttempts)
+            )
+            
+            # Retry failed attempts and jobs with an expired lease before starting new words
+            jobRow = self.conn.execute(
+                """
+                SELECT id FROM jobs
+                WHERE attempts < ?
+                AND (status = 'pending' OR (status = 'running' AND lease_expires_at <= ?))
+                ORDER BY updated_at
+                LIMIT 1
+                """,
+                (maxAttempts, now)
+            ).fetchone()
+            
+            if jobRow:
+                jobId = jobRow['id']
+            else:
+                wordRow = self._randomEligibleWord(
+                    [
+                        "NOT EXISTS (SELECT 1 FROM jobs j WHERE j.word_id = words.id)",
+                        "NOT EXISTS (SELECT 1 FROM word_reservations r WHERE r.word_id = words.id AND r.expires_at > ?)"
+                    ],
+                    (now,)
+                )
+                if not wordRow:
+                    self.conn.commit()
+                    return None
+                
+                jobId = self.conn.execute(
+                    "INSERT INTO jobs (word_id, stage, status, updated_at) VALUES (?, ?, 'pending', ?)",
+                    (wordRow['id'], JOB_STAGES[0], now)
+                ).lastrowid
+            
+            # Every attempt starts from the first stage; completed downloads are skipped on disk
+            self.conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running', stage = ?, lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+                """,
+                (JOB_STAGES[0], owner, now + leaseSeconds, now, jobId)
+            )
+            jobRow = self.conn.execute(
+                "SELECT jobs.*, words.word FROM jobs JOIN words ON words.id = jobs.word_id WHERE jobs.id = ?",
+                (jobId,)
+            ).fetchone()
+            self.conn.commit()
+            return jobRow
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def heartbeatJob(self, jobId, owner, leaseSeconds):
+        """Extend owner's lease on a running job; returns False if the lease was lost"""
+        now = time.time()
         cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT * FROM words 
-            WHERE clips_found > 4 
-            AND video_created = 0
-            ORDER BY RANDOM() 
-            LIMIT 1
+            UPDATE jobs
+            SET lease_expires_at = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """,
+            (now + leaseSeconds, now, jobId, owner)
+        )
+        self.conn.commit()
+        return cursor.rowcount > 0
+    
+    def completeJob(self, jobId, owner, stage):
+        """Record a finished stage; finishing the last stage marks the job done and the word processed"""
+        now = time.time()
+        nextIndex = JOB_STAGES.index(stage) + 1
+        self._beginImmediate()
+        try:
+            if nextIndex < len(JOB_STAGES):
+                cursor = self.conn.execute(
+                    """
+                    UPDATE jobs SET stage = ?, updated_at = ?
+                    WHERE id = ? AND lease_owner = ? AND status = 'running'
+                    """,
+                    (JOB_STAGES[nextIndex], now, jobId, owner)
+                )
+            else:
+                cursor = self.conn.execute(
+                    """
+                    UPDATE jobs
+                    SET stage = 'done', status = 'done', lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                    WHERE id = ? AND lease_owner = ? AND status = 'running'
+                    """,
+                    (now, jobId, owner)
+                )
+                if cursor.rowcount:
+                    self.conn.execute(
+                        "UPDATE words SET video_created = 1 WHERE id = (SELECT word_id FROM jobs WHERE id = ?)",
+                        (jobId,)
+                    )
+            self.conn.commit()
+            return cursor.rowcount > 0
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def failJob(self, jobId, owner, errorMessage, maxAttempts=3):
+        """Release owner's lease after a failed attempt; the job is retried until maxAttempts is reached"""
+        cursor = self.conn.cursor()
+        cursor.execute(
             """
+            UPDATE jobs
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                lease_owner = NULL, lease_expires_at = NULL, last_error = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """,
+            (maxAttempts, errorMessage, time.time(), jobId, owner)
         )
-        return cursor.fetchone()
+        self.conn.commit()
+        return cursor.rowcount > 0
     
     def markWordAsProcessed(self, wordId):
         """Mark a word as processed (video created)"""
@@ -151,16 +536,17 @@ class DBController:
     # Helper functions for script compatibility
     def getWordDataDict(self, word):
         """Get a word's data in a dictionary format similar to the original JSON structure"""
-        wordRow = self.getWord(word)
-        if not wordRow:
+        rows = self.getWordWithClips(word)
+        if not rows:
             return None
         
-        wordId = wordRow['id']
-        clips = self.getClipsForWord(wordId)
+        wordRow = rows[0]
         
         # Convert to dictionary format similar to the old JSON structure
         clipData = {}
-        for clip in clips:
+        for clip in rows:
+            if clip['clip_id'] is None:
+                continue
             clipData[str(clip['clip_index'])] = {
                 'videoURL': clip['video_url'],
                 'subtitle': clip['subtitle'],
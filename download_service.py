@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Long-lived download service: one pooled HTTP session and one executor shared by every word
+"""
+import os
+import re
+import time
+import threading
+import contextlib
+import concurrent.futures
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from config import DOWNLOAD_WORKERS, DOWNLOAD_PER_HOST_LIMIT
+
+class IncompleteDownload(Exception):
+    pass
+
+def handleUnsatisfiableRange(partPath, existingBytes, contentRange):
+    """Handle a 416 answer to a resume request: True if the part file is already the whole resource"""
+    # The server reports the resource size as "Content-Range: bytes */total"
+    match = re.search(r"\*/(\d+)$", contentRange or "")
+    if match and existingBytes and existingBytes == int(match.group(1)):
+        return True
+    
+    # Longer than the resource (or its size is unknown): the part can't be trusted, so start over
+    if os.path.exists(partPath):
+        os.remove(partPath)
+    raise IncompleteDownload("Range not satisfiable, restarting download")
+
+class DownloadService:
+    def __init__(self, maxWorkers=DOWNLOAD_WORKERS, perHostLimit=DOWNLOAD_PER_HOST_LIMIT):
+        """Create the pooled session (keep-alive connections are reused across clips and words)"""
+        self.maxWorkers = maxWorkers
+        self.perHostLimit = perHostLimit
+
+        self.session = requests.Session()
+        # pool_block makes a full pool wait for a free connection; callers must close every response
+        # (use `with session.get(...) as response:`), or its connection is never returned to the pool
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=maxWorkers, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=maxWorkers, thread_name_prefix="download"
+        )
+
+        self.lock = threading.Lock()
+        self.hostSemaphores = {}
+
+        # Aggregate throughput is measured over the time at least one transfer was running
+        self.totalBytes = 0
+        self.totalClips = 0
+        self.activeTransfers = 0
+        self.activeSince = None
+        self.activeSeconds = 0.0
+
+    def submit(self, func, *args, **kwargs):
+        """Run a download job on the shared executor"""
+        return self.executor.submit(func, *args, **kwargs)
+
+    def _hostSemaphore(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.hostSemaphores:
+                self.hostSemaphores[host] = threading.BoundedSemaphore(self.perHostLimit)
+            return self.hostSemaphores[host]
+
+    @contextlib.contextmanager
+    def transfer(self, url):
+        """Hold a per-host slot for the duration of one transfer and account for its active time"""
+        semaphore = self._hostSemaphore(url)
+        with semaphore:
+            with self.lock:
+                if self.activeTransfers == 0:
+                    self.activeSince = time.time()
+                self.activeTransfers += 1
+            try:
+                yield self.session
+            finally:
+                with self.lock:
+                    self.activeTransfers -= 1
+                    if self.activeTransfers == 0:
+                        self.activeSeconds += time.time() - self.activeSince
+                        self.activeSince = None
+
+    def recordTransfer(self, byteCount, clipCompleted=False):
+        with self.lock:
+            self.totalBytes += byteCount
+            if clipCompleted:
+                self.totalClips += 1
+
+    def stats(self):
+        """Return aggregate throughput across every word downloaded by this process"""
+        with self.lock:
+            activeSeconds = self.activeSeconds
+            if self.activeSince is not None:
+                activeSeconds += time.time() - self.activeSince
+            totalMb = self.totalBytes / (1024 * 1024)
+            return {
+                "clips": self.totalClips,
+                "sizeMb": totalMb,
+                "activeSeconds": activeSeconds,
+                "mbPerSecond": totalMb / activeSeconds if activeSeconds > 0 else 0,
+                "clipsPerSecond": self.totalClips / activeSeconds if activeSeconds > 0 else 0
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+_service = None
+_serviceLock = threading.Lock()
+
+def getDownloadService():
+    """Return the process-wide download service, creating it on first use"""
+    global _service
+    with _serviceLock:
+        if _service is None:
+            _service = DownloadService()
+        return _service
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Thread-safe ffmpeg/ffprobe runner shared by the video stages
+"""
+import json
+import time
+import shutil
+import threading
+import subprocess
+from collections import deque
+
+STDERR_TAIL_LINES = 20
+
+def parseSpeed(value):
+    """Convert an ffmpeg speed value such as '2.35x' to a float"""
+    try:
+        return float(value.strip().rstrip('x'))
+    except (AttributeError, ValueError):
+        return None
+
+def runFfmpeg(args, onProgress=None, timeout=None):
+    """Run ffmpeg with output captured for this process only and return a result dict.
+
+    `args` are the ffmpeg arguments without the executable. `onProgress` is called with a
+    dict of the latest `-progress` values (frame, fps, speed, outTimeMs) after every update.
+    """
+    command = [
+        'ffmpeg', '-hide_banner', '-nostdin', '-nostats',
+        '-loglevel', 'error', '-progress', 'pipe:1',
+        *args
+    ]
+
+    startTime = time.time()
+    progress = {"frame": 0, "fps": None, "speed": None, "outTimeMs": 0}
+    stderrTail = deque(maxlen=STDERR_TAIL_LINES)
+
+    try:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace'
+        )
+    except OSError as e:
+        return {
+            "success": False, "returncode": None, "error": str(e),
+            "elapsed": 0, **progress
+        }
+
+    def drainStderr():
+        for line in process.stderr:
+            if line.strip():
+                stderrTail.append(line.rstrip())
+
+    stderrThread = threading.Thread(target=drainStderr, daemon=True)
+    stderrThread.start()
+
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+
+    try:
+        for line in process.stdout:
+            key, _, value = line.strip().partition('=')
+            if key == 'frame':
+                progress["frame"] = int(value) if value.isdigit() else progress["frame"]
+            elif key == 'fps':
+                progress["fps"] = parseSpeed(value)
+            elif key == 'speed':
+                progress["speed"] = parseSpeed(value)
+            elif key == 'out_time_ms' and value.isdigit():
+                # Despite its name ffmpeg reports this value in microseconds
+                progress["outTimeMs"] = int(value) // 1000
+            elif key == 'progress' and onProgress:
+                onProgress(dict(progress))
+        returncode = process.wait()
+    finally:
+        if timer:
+            timer.cancel()
+        # An exception from onProgress leaves the loop early; ffmpeg must not keep running unobserved
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderrThread.join(timeout=5)
+
+    return {
+        "success": returncode == 0,
+        "returncode": returncode,
+        "error": "\n".join(stderrTail) if returncode != 0 else "",
+        "elapsed": time.time() - startTime,
+        **progress
+    }
+
+def runFfprobe(args, timeout=60):
+    """Run ffprobe with captured output and return a result dict"""
+    command = ['ffprobe', '-v', 'error', *args]
+
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, errors='replace', timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return {"success": False, "returncode": None, "output": "", "error": str(e)}
+
+    return {
+        "success": process.returncode == 0,
+        "returncode": process.returncode,
+        "output": process.stdout,
+        "error": process.stderr.strip()
+    }
+
+def probeStreams(mediaPath, entries):
+    """Return the stream entries ffprobe reports for a file, or None if it can't be probed"""
+    result = runFfprobe(['-show_entries', f'stream={entries}', '-of', 'json', mediaPath])
+    if not result["success"]:
+        return None
+
+    try:
+        return json.loads(result["output"]).get('streams', [])
+    except json.JSONDecodeError:
+        return None
+
+def isValidVideo(videoPath):
+    """Quick container check: ffprobe must find a video stream (skipped if ffprobe isn't installed)"""
+    if not shutil.which('ffprobe'):
+        return True
+
+    streams = probeStreams(videoPath, 'codec_type')
+    return bool(streams) and any(stream.get('codec_type') == 'video' for stream in streams)
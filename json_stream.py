@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Incremental reading and writing of the word JSON files, one top-level entry at a time
+"""
+import os
+import json
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+# Characters that can follow a complete number (or true/false/null) inside an object or array
+DELIMITERS = WHITESPACE + ",}]"
+
+class _ObjectReader:
+    """Buffered reader over a file that holds a single JSON object"""
+    def __init__(self, file, chunkSize):
+        self.file = file
+        self.chunkSize = chunkSize
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append the next chunk, dropping what has already been consumed; returns False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunkSize)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def nextChar(self):
+        """Skip whitespace and return the next character without consuming it ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.nextChar()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next JSON value, reading more of the file until it is complete"""
+        self.nextChar()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number cut by the chunk boundary decodes as a shorter number ("1." as 1), so it is only
+                # complete once a delimiter follows it or the file has ended
+                complete = (
+                    isinstance(value, (dict, list, str))
+                    or self.eof
+                    or (end < len(self.buffer) and self.buffer[end] in DELIMITERS)
+                )
+                if complete:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+def iterJsonObject(path, chunkSize=CHUNK_SIZE):
+    """Yield the (key, value) pairs of the top-level JSON object in path without loading the whole file"""
+    with open(path, "r", encoding="utf-8") as file:
+        reader = _ObjectReader(file, chunkSize)
+        reader.expect("{")
+        if reader.nextChar() == "}":
+            return
+
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting a string key", reader.buffer, reader.pos)
+            reader.expect(":")
+            yield key, reader.value()
+            if reader.expect(",}") == "}":
+                return
+
+class JsonObjectWriter:
+    """Write a top-level JSON object one entry at a time, in the same layout as json.dump(data, indent=2)"""
+    def __init__(self, path, indent=2):
+        self.path = path
+        self.tempPath = f"{path}.tmp"
+        self.indent = indent
+        self.file = None
+        self.count = 0
+
+    def __enter__(self):
+        # Entries go to a temporary file that replaces path only on success, so an interrupted run never
+        # truncates the file (and path may be the very file being read with iterJsonObject)
+        self.file = open(self.tempPath, "w", encoding="utf-8")
+        self.file.write("{")
+        return self
+
+    def write(self, key, value):
+        padding = " " * self.indent
+        encoded = json.dumps(value, indent=self.indent).replace("\n", "\n" + padding)
+        self.file.write(f"{',' if self.count else ''}\n{padding}{json.dumps(key)}: {encoded}")
+        self.count += 1
+
+    def __exit__(self, excType, excVal, excTb):
+        if excType is None:
+            self.file.write("\n}" if self.count else "}")
+            self.file.close()
+            os.replace(self.tempPath, self.path)
+        else:
+            self.file.close()
+            os.remove(self.tempPath)
+
+def writeJsonObject(path, items, indent=2):
+    """Write (key, value) pairs as a JSON object through a JsonObjectWriter; returns the number written"""
+    with JsonObjectWriter(path, indent) as writer:
+        for key, value in items:
+            writer.write(key, value)
+    return writer.count
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Bounded multi-stage pipeline used to overlap the per-word stages in app.py
+"""
+import time
+import queue
+import threading
+import traceback
+
+_STOP = object()
+
+class Stage:
+    """A unit of work run by `workers` threads, fed through a queue of at most `queueSize` items"""
+    def __init__(self, name, func, workers=1, queueSize=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.inbox = queue.Queue(maxsize=max(1, queueSize))
+        self.activeWorkers = 0
+        self.processed = 0
+        self.failed = 0
+        self.busySeconds = 0.0
+        self.lock = threading.Lock()
+
+class Pipeline:
+    """Run items through stages in order; a full queue blocks the stage feeding it (backpressure)"""
+    def __init__(self, stages, onDone=None, onFail=None):
+        self.stages = stages
+        self.onDone = onDone
+        self.onFail = onFail
+        self.threads = []
+        self.startTime = None
+        self.completed = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.startTime = time.time()
+        for stageIndex, stage in enumerate(self.stages):
+            stage.activeWorkers = stage.workers
+            for workerIndex in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stageIndex,),
+                    name=f"{stage.name}-{workerIndex}",
+                    daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+        return self
+
+    def submit(self, item):
+        """Queue an item for the first stage, blocking while that stage is saturated"""
+        self.stages[0].inbox.put(item)
+
+    def close(self):
+        """Signal that no more items will be submitted"""
+        for _ in range(self.stages[0].workers):
+            self.stages[0].inbox.put(_STOP)
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+    def _worker(self, stageIndex):
+        stage = self.stages[stageIndex]
+        nextStage = self.stages[stageIndex + 1] if stageIndex + 1 < len(self.stages) else None
+
+        while True:
+            item = stage.inbox.get()
+            if item is _STOP:
+                break
+
+            stageStart = time.time()
+            try:
+                result = stage.func(item)
+            except Exception:
+                traceback.print_exc()
+                result = False
+            elapsed = time.time() - stageStart
+
+            with stage.lock:
+                stage.busySeconds += elapsed
+                if result:
+                    stage.processed += 1
+                else:
+                    stage.failed += 1
+
+            if not result:
+                if self.onFail:
+                    self.onFail(item, stage.name)
+            elif nextStage:
+                nextStage.inbox.put(item)
+            else:
+                with self.lock:
+                    self.completed += 1
+                if self.onDone:
+                    self.onDone(item)
+
+        # The last worker of a stage to exit passes the stop signal downstream
+        with stage.lock:
+            stage.activeWorkers -= 1
+            lastWorker = stage.activeWorkers == 0
+        if lastWorker and nextStage:
+            for _ in range(nextStage.workers):
+                nextStage.inbox.put(_STOP)
+
+    def stats(self):
+        """Return overall throughput and per-stage counters"""
+        elapsed = time.time() - self.startTime if self.startTime else 0
+        return {
+            "completed": self.completed,
+            "elapsed": elapsed,
+            "wordsPerHour": self.completed / elapsed * 3600 if elapsed > 0 else 0,
+            "stages": {
+                stage.name: {
+                    "processed": stage.processed,
+                    "failed": stage.failed,
+                    "busySeconds": stage.busySeconds
+                }
+                for stage in self.stages
+            }
+        }
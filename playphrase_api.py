@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Browserless playphrase collector: reads clips from the search endpoint the site's own player calls
+
+Experimental: the endpoint URL and its response schema have not been confirmed against a recorded response,
+so SCRAPE_COLLECTOR defaults to the browser and any response this module can't read falls back to it.
+"""
+import threading
+from utils import warning
+from download_service import getDownloadService
+from clip_rules import CLIPS_PER_WORD
+from config import PLAYPHRASE_API_URL, PLAYPHRASE_API_TOKEN, PLAYPHRASE_API_MAX_FAILURES, SCRAPE_MAX_POSITIONS
+
+REQUEST_TIMEOUT = 15
+
+class PlayphraseApiError(Exception):
+    pass
+
+def firstValue(record, *keys):
+    for key in keys:
+        value = record.get(key)
+        if value:
+            return value
+    return None
+
+def parsePhrase(phrase):
+    """Convert one search result into the clipData shape, or None if it has no video or subtitle"""
+    # The field names are unconfirmed, so the likely spellings are all accepted until a real response is recorded
+    if not isinstance(phrase, dict):
+        return None
+    videoURL = firstValue(phrase, "video-url", "videoUrl", "video_url", "url")
+    if not videoURL:
+        return None
+
+    subtitle = firstValue(phrase, "text", "subtitle")
+    if not subtitle and phrase.get("words"):
+        subtitle = " ".join(word.get("text", "") for word in phrase["words"] if isinstance(word, dict))
+    if not subtitle or not subtitle.strip():
+        return None
+
+    videoInfo = phrase.get("video-info") or phrase.get("videoInfo")
+    if isinstance(videoInfo, dict):
+        videoInfo = firstValue(videoInfo, "info", "title")
+
+    return {
+        "videoURL": videoURL,
+        "subtitle": subtitle.strip(),
+        "videoInfo": (videoInfo or "N/A").strip()
+    }
+
+def phrasesFromResponse(payload):
+    """Return (phrases, total result count) from a search response"""
+    if isinstance(payload, list):
+        return payload, len(payload)
+    if not isinstance(payload, dict):
+        raise PlayphraseApiError(f"Unexpected search response: {type(payload).__name__}")
+
+    phrases = firstValue(payload, "phrases", "results", "data") or []
+    total = payload.get("count", payload.get("total", len(phrases)))
+    return phrases, total
+
+class PlayphraseClient:
+    def __init__(self, searchUrl=PLAYPHRASE_API_URL, token=PLAYPHRASE_API_TOKEN, maxFailures=PLAYPHRASE_API_MAX_FAILURES):
+        """Search client sharing the download service's pooled session"""
+        self.searchUrl = searchUrl
+        self.headers = {"Accept": "application/json"}
+        if token:
+            self.headers["x-csrf-token"] = token
+        self.maxFailures = maxFailures
+
+        self.lock = threading.Lock()
+        self.consecutiveFailures = 0
+
+    @property
+    def available(self):
+        """False once the endpoint has failed maxFailures times in a row, so callers stop trying it"""
+        with self.lock:
+            return self.consecutiveFailures < self.maxFailures
+
+    def _searchPage(self, word, skip, limit):
+        service = getDownloadService()
+        params = {"q": word, "limit": limit, "skip": skip, "language": "en"}
+        with service.transfer(self.searchUrl) as session:
+            response = session.get(self.searchUrl, params=params, headers=self.headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            raise PlayphraseApiError(f"Search for '{word}' returned HTTP {response.status_code}")
+        try:
+            return phrasesFromResponse(response.json())
+        except ValueError as e:
+            raise PlayphraseApiError(f"Search for '{word}' did not return JSON: {e}")
+
+    def searchClips(self, word, clipFilter=None, clipsPerWord=CLIPS_PER_WORD, pageSize=SCRAPE_MAX_POSITIONS):
+        """Return up to clipsPerWord usable clips for word as a clipData dict keyed "1", "2", ..."""
+        clips = []
+        parsedCount = 0
+
+        def addUsable(phrases):
+            nonlocal parsedCount
+            for clip in map(parsePhrase, phrases):
+                if clip:
+                    parsedCount += 1
+                # The length check comes first so surplus results don't claim URLs in the shared filter
+                if clip and len(clips) < clipsPerWord and not (clipFilter and clipFilter.rejections(clip)):
+                    clips.append(clip)
+
+        phrases, total = self._searchPage(word, 0, pageSize)
+        # An empty or unreadable answer may just mean the endpoint or its schema changed, so it must not
+        # mark the word as searched with no clips; the caller falls back to the browser instead
+        if not phrases:
+            raise PlayphraseApiError(f"Search for '{word}' returned no results")
+        addUsable(phrases)
+        if not parsedCount:
+            raise PlayphraseApiError(f"Search for '{word}' returned {len(phrases)} results without a readable clip")
+
+        # Results without a video or breaking the clip rules are skipped, so top up once if the site has more
+        if len(clips) < clipsPerWord and total > len(phrases) and phrases:
+            phrases, total = self._searchPage(word, len(phrases), pageSize)
+            addUsable(phrases)
+
+        return {str(index): clip for index, clip in enumerate(clips, start=1)}
+
+    def collect(self, word, clipFilter=None):
+        """Search clips for word; returns None when the endpoint fails so the caller can use the browser"""
+        try:
+            clipData = self.searchClips(word, clipFilter)
+        except Exception as e:
+            with self.lock:
+                self.consecutiveFailures += 1
+                failures = self.consecutiveFailures
+            print(warning(f"⚠️  Search API failed for '{word}' ({failures}/{self.maxFailures}): {e}"))
+            if failures == self.maxFailures:
+                print(warning("⚠️  Search API disabled for this run, collecting with the browser"))
+            return None
+
+        with self.lock:
+            self.consecutiveFailures = 0
+        return clipData
+
+_client = None
+_clientLock = threading.Lock()
+
+def getPlayphraseClient():
+    """Return the process-wide search client, creating it on first use"""
+    global _client
+    with _clientLock:
+        if _client is None:
+            _client = PlayphraseClient()
+        return _client
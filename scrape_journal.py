@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for the scraper, compacted into the word JSON file every few words
+"""
+import os
+import json
+from config import JSON_FILE, JOURNAL_FILE, JOURNAL_COMPACT_WORDS, pathStr
+from json_stream import writeJsonObject
+
+def newWordEntry():
+    return {"searched": False, "clipsFound": 0, "clipData": {}}
+
+def startEvent(word):
+    return {"type": "start", "word": word}
+
+def clipEvent(word, clipIndex, clipInfo):
+    return {"type": "clip", "word": word, "index": clipIndex, "clip": clipInfo}
+
+def wordEvent(word, searched, clipsFound):
+    return {"type": "word", "word": word, "searched": searched, "clipsFound": clipsFound}
+
+def applyEvent(data, event):
+    """Apply one start, clip or word event to the word data; every event just sets values, so it is idempotent"""
+    wordData = data.setdefault(event["word"], newWordEntry())
+    if event["type"] == "start":
+        # A word is scraped again from clip 1, so clips left by an interrupted earlier attempt are dropped
+        # (other fields, like the meaning, are kept)
+        wordData.update(newWordEntry())
+    elif event["type"] == "clip":
+        wordData.setdefault("clipData", {})[str(event["index"])] = event["clip"]
+    elif event["type"] == "word":
+        wordData["searched"] = event["searched"]
+        wordData["clipsFound"] = event["clipsFound"]
+
+class ScrapeJournal:
+    """Records each scraped clip and finished word as one JSONL line instead of rewriting the whole JSON file"""
+    def __init__(self, jsonPath=JSON_FILE, journalPath=JOURNAL_FILE, compactEvery=JOURNAL_COMPACT_WORDS):
+        self.jsonPath = pathStr(jsonPath)
+        self.journalPath = pathStr(journalPath)
+        self.compactEvery = compactEvery
+        self.wordsSinceCompact = 0
+        self.file = None
+
+    def replay(self, data):
+        """Apply events left by an interrupted run to data; returns the number of events applied"""
+        if not os.path.exists(self.journalPath):
+            return 0
+
+        applied = 0
+        with open(self.journalPath, "r", encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short when the process died mid-write; the events around it are intact
+                    continue
+                applyEvent(data, event)
+                applied += 1
+        return applied
+
+    def _append(self, event, sync=False):
+        if self.file is None:
+            self.file = open(self.journalPath, "a", encoding="utf-8")
+            # Start on a fresh line if an interrupted run left a partial one behind
+            if self.file.tell():
+                with open(self.journalPath, "rb") as existing:
+                    existing.seek(-1, os.SEEK_END)
+                    if existing.read(1) != b"\n":
+                        self.file.write("\n")
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+
+    def record(self, data, event):
+        """Apply an event to data and checkpoint it; the cost is one short append whatever the size of the corpus"""
+        applyEvent(data, event)
+        # Finished words are synced to disk, clips only flushed
+        isWord = event["type"] == "word"
+        self._append(event, sync=isWord)
+        if isWord:
+            self.wordsSinceCompact += 1
+
+    def maybeCompact(self, data):
+        """Compact once enough words have been journaled since the last compaction"""
+        if self.wordsSinceCompact >= self.compactEvery:
+            self.compact(data)
+
+    def compact(self, data):
+        """Write data to the JSON file, then empty the journal"""
+        # The JSON file is replaced atomically before the journal is cleared. If the process dies in between,
+        # replaying the journal again is harmless because every event just sets a value
+        writeJsonObject(self.jsonPath, data.items())
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        open(self.journalPath, "w", encoding="utf-8").close()
+        self.wordsSinceCompact = 0
@@ -0,0 +1,115 @@
+"""
+Offline tests for the browserless collector, against a local stand-in for the playphrase search endpoint
+
+The search responses in tests/fixtures/synthetic_*.json are synthetic: they were written by hand in the shape
+parsePhrase reads, not captured from playphrase.me. These tests cover paging, clip filtering and the browser
+fallback; they do not show that the real endpoint answers in this schema.
+"""
+import os
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import pytest
+from clip_rules import ClipFilter
+from playphrase_api import PlayphraseClient, PlayphraseApiError, parsePhrase
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def loadFixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+class StandInSearchHandler(BaseHTTPRequestHandler):
+    """Answers search requests with the synthetic responses, keyed by query and skip"""
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        word = query["q"][0]
+        skip = int(query.get("skip", ["0"])[0])
+        self.server.requests.append((word, skip))
+
+        if word == "broken":
+            self.reply(500, {"error": "internal"})
+        elif word == "abase":
+            self.reply(200, loadFixture(f"synthetic_search_abase_page{1 if skip == 0 else 2}.json"))
+        elif word == "nothing":
+            self.reply(200, {"count": 0, "phrases": []})
+        elif word == "renamed":
+            # Results in a schema the parser doesn't know
+            self.reply(200, {"count": 2, "phrases": [{"clip": {"src": "a.mp4"}}, {"clip": {"src": "b.mp4"}}]})
+        else:
+            self.reply(404, {"error": "not found"})
+
+    def reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def searchServer():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSearchHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(searchServer):
+    return PlayphraseClient(searchUrl=f"http://127.0.0.1:{searchServer.server_port}/search", maxFailures=2)
+
+def test_parsePhrase_maps_a_synthetic_result_to_clipData():
+    phrase = loadFixture("synthetic_search_abase_page1.json")["phrases"][0]
+    assert parsePhrase(phrase) == {
+        "videoURL": phrase["video-url"],
+        "subtitle": "You must abase yourself before her.",
+        "videoInfo": "Spartacus (1960) [01:23:35]"
+    }
+
+def test_parsePhrase_rejects_results_without_video_or_subtitle():
+    assert parsePhrase({"text": "no video here at all"}) is None
+    assert parsePhrase({"video-url": "https://example.com/a.mp4"}) is None
+    assert parsePhrase("not a phrase") is None
+
+def test_searchClips_fills_clips_from_one_or_two_pages(client, searchServer):
+    clipData = client.searchClips("abase", ClipFilter())
+
+    # Page 1 has a short subtitle, a result without a video and a duplicate, so page 2 tops it up to 10
+    assert list(clipData) == [str(index) for index in range(1, 11)]
+    assert searchServer.requests == [("abase", 0), ("abase", 10)]
+    urls = [clip["videoURL"] for clip in clipData.values()]
+    assert len(set(urls)) == len(urls)
+    assert all(len(clip["subtitle"].split()) >= 4 for clip in clipData.values())
+    assert set(clipData["1"]) == {"videoURL", "subtitle", "videoInfo"}
+
+def test_searchClips_skips_urls_collected_for_other_words(client):
+    page1 = loadFixture("synthetic_search_abase_page1.json")
+    clipFilter = ClipFilter([page1["phrases"][0]["video-url"]])
+
+    clipData = client.searchClips("abase", clipFilter)
+
+    assert page1["phrases"][0]["video-url"] not in [clip["videoURL"] for clip in clipData.values()]
+
+@pytest.mark.parametrize("word", ["nothing", "renamed", "broken"])
+def test_empty_unreadable_or_failed_responses_fall_back(client, word):
+    with pytest.raises(PlayphraseApiError):
+        client.searchClips(word)
+    assert client.collect(word) is None
+
+def test_client_disables_itself_after_consecutive_failures(client):
+    assert client.collect("broken") is None
+    assert client.available
+    assert client.collect("nothing") is None
+    assert not client.available
+
+def test_a_success_resets_the_failure_count(client):
+    assert client.collect("broken") is None
+    assert len(client.collect("abase")) == 10
+    assert client.consecutiveFailures == 0
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared video profile for intermediate and final encodes
+"""
+from config import getEnvVar
+from ffmpeg_runner import probeStreams
+
+# Every intermediate (per-clip videos, intro, outro) is encoded with these parameters
+# so the final merge can join them with the concat demuxer and -c copy
+VIDEO_WIDTH = int(getEnvVar('VIDEO_WIDTH', '1080'))
+VIDEO_HEIGHT = int(getEnvVar('VIDEO_HEIGHT', '1920'))
+VIDEO_FPS = int(getEnvVar('VIDEO_FPS', '30'))
+VIDEO_TIMESCALE = int(getEnvVar('VIDEO_TIMESCALE', '15360'))
+AUDIO_SAMPLE_RATE = int(getEnvVar('AUDIO_SAMPLE_RATE', '44100'))
+AUDIO_BITRATE = getEnvVar('AUDIO_BITRATE', '192k')
+
+def videoNormalizeFilter():
+    """Filter chain that brings any video stream to the shared resolution, SAR, fps and pixel format"""
+    return f"scale={VIDEO_WIDTH}:{VIDEO_HEIGHT},setsar=1,fps={VIDEO_FPS},format=yuv420p"
+
+def audioNormalizeFilter():
+    """Filter chain that brings any audio stream to the shared sample rate and layout"""
+    return f"aresample={AUDIO_SAMPLE_RATE},aformat=sample_fmts=fltp:channel_layouts=stereo"
+
+def encodeArgs(preset='medium'):
+    """Codec arguments shared by every encode of the profile"""
+    return [
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-crf', '23',
+        '-profile:v', 'high',
+        '-pix_fmt', 'yuv420p',
+        '-r', str(VIDEO_FPS),
+        '-video_track_timescale', str(VIDEO_TIMESCALE),
+        '-c:a', 'aac',
+        '-b:a', AUDIO_BITRATE,
+        '-ar', str(AUDIO_SAMPLE_RATE),
+        '-ac', '2'
+    ]
+
+def probeSignature(videoPath):
+    """Return the codec parameters that must match for a stream-copy concat, or None if probing fails"""
+    streams = probeStreams(
+        videoPath,
+        'codec_type,codec_name,profile,width,height,pix_fmt,sample_aspect_ratio,'
+        'r_frame_rate,time_base,sample_rate,channels,channel_layout'
+    )
+    if not streams:
+        return None
+
+    signature = []
+    for stream in streams:
+        if stream.get('codec_type') == 'video':
+            keys = ('codec_name', 'profile', 'width', 'height', 'pix_fmt', 'sample_aspect_ratio', 'r_frame_rate', 'time_base')
+        elif stream.get('codec_type') == 'audio':
+            keys = ('codec_name', 'sample_rate', 'channels', 'channel_layout', 'time_base')
+        else:
+            continue
+        signature.append((stream['codec_type'],) + tuple(stream.get(key) for key in keys))
+
+    return tuple(signature) if signature else None
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Streaming ingestion: each word the scraper finishes is cleaned and upserted into greWords.db right away
+"""
+import copy
+from utils import error
+from db_controller import DBController
+from ac_CleanJson import cleanWordData
+from ad_ConvertDB import createDatabase, syncWords, DB_FILE
+
+class WordIngestor:
+    """Writes finished words into the words/clips tables, one short transaction per word"""
+    def __init__(self, dbPath=DB_FILE):
+        self.dbPath = dbPath
+        self.db = DBController(dbPath)
+        self.schemaReady = False
+        self.wordsIngested = 0
+
+    def ingest(self, word, wordData):
+        """Clean a copy of the word entry and upsert it; returns False if the database write failed"""
+        if not self.schemaReady:
+            # The words/clips schema belongs to ad_ConvertDB; it may not exist yet on a fresh checkout
+            createDatabase(self.dbPath).close()
+            self.schemaReady = True
+
+        # The scraper's own entry is left as collected; only the database copy is cleaned
+        cleaned = copy.deepcopy(wordData)
+        # Duplicates across words were already rejected by the scraper's shared ClipFilter
+        cleanWordData(word, cleaned)
+
+        try:
+            with self.db.immediateTransaction() as conn:
+                cursor = conn.cursor()
+                existingWords = dict(cursor.execute("SELECT word, source_hash FROM words WHERE word = ?", (word,)).fetchall())
+                syncWords(cursor, [(word, cleaned)], existingWords)
+        except Exception as e:
+            # The word is still in the JSON file, so a later ad_ConvertDB.py run picks it up
+            print(error(f"❌ Could not write '{word}' to the database: {e}"))
+            return False
+
+        self.wordsIngested += 1
+        return True
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+A word and its clips, loaded from the database once and passed through every processing stage
+"""
+from db_controller import db
+
+class ClipRecord:
+    """One clip of a word; __slots__ keeps it smaller than the sqlite3.Row it replaces"""
+    __slots__ = ("id", "clipIndex", "videoUrl", "subtitle", "videoInfo", "videoStartHeight")
+
+    def __init__(self, id, clipIndex, videoUrl, subtitle, videoInfo, videoStartHeight):
+        self.id = id
+        self.clipIndex = clipIndex
+        self.videoUrl = videoUrl
+        self.subtitle = subtitle
+        self.videoInfo = videoInfo
+        self.videoStartHeight = videoStartHeight
+
+class WordJob:
+    """A word row with its clips ordered by clip index"""
+    __slots__ = ("id", "word", "meaning", "clipsFound", "videoCreated", "videoUploaded", "uploadTime", "clips")
+
+    def __init__(self, id, word, meaning, clipsFound, videoCreated, videoUploaded, uploadTime, clips):
+        self.id = id
+        self.word = word
+        self.meaning = meaning
+        self.clipsFound = clipsFound
+        self.videoCreated = videoCreated
+        self.videoUploaded = videoUploaded
+        self.uploadTime = uploadTime
+        self.clips = clips
+
+    @classmethod
+    def fromRows(cls, rows):
+        """Build a WordJob from the rows of DBController.getWordWithClips, or None if there are none"""
+        if not rows:
+            return None
+
+        first = rows[0]
+        clips = [
+            ClipRecord(
+                row['clip_id'], row['clip_index'], row['video_url'],
+                row['subtitle'], row['video_info'], row['video_start_height']
+            )
+            for row in rows
+            if row['clip_id'] is not None
+        ]
+        return cls(
+            first['word_id'], first['word'], first['meaning'], first['clips_found'],
+            bool(first['video_created']), bool(first['video_uploaded']), first['upload_time'], clips
+        )
+
+def loadWordJob(word):
+    """Load a word and all of its clips with a single query; returns None if the word doesn't exist"""
+    return WordJob.fromRows(db.getWordWithClips(word))
+
+def resolveWordJob(word, wordJob=None):
+    """Return the given word job, or load it from the database"""
+    return wordJob or loadWordJob(word)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Per-word workspace directories for the intermediate media of one processing run
+"""
+import os
+import time
+import shutil
+from config import WORKSPACES_DIR, pathStr
+
+class Workspace:
+    """Images, downloaded clips and merged clips of a single word, isolated from other words"""
+    def __init__(self, word, root=None):
+        self.word = word
+        self.root = pathStr(root or WORKSPACES_DIR)
+        self.path = os.path.join(self.root, word)
+        self.imagesDir = os.path.join(self.path, "images")
+        self.downloadsDir = os.path.join(self.path, "downloadedVideos")
+        self.mergedDir = os.path.join(self.path, "mergedVideos")
+
+    def create(self):
+        """Create the workspace directories and return the workspace"""
+        for directory in (self.imagesDir, self.downloadsDir, self.mergedDir):
+            os.makedirs(directory, exist_ok=True)
+        return self
+
+    def cleanup(self):
+        """Remove the workspace and everything in it; returns the number of files removed"""
+        if not os.path.isdir(self.path):
+            return 0
+
+        fileCount = sum(len(files) for _, _, files in os.walk(self.path))
+        shutil.rmtree(self.path, ignore_errors=True)
+        return fileCount
+
+    def imagePath(self, index):
+        return os.path.join(self.imagesDir, f"{self.word}{index}.png")
+
+    def downloadPath(self, index):
+        return os.path.join(self.downloadsDir, f"{self.word}{index}.mp4")
+
+    def mergedPath(self, index):
+        return os.path.join(self.mergedDir, f"{self.word}{index}.mp4")
+
+    def introImagePath(self):
+        return os.path.join(self.imagesDir, "intro.png")
+
+    def outroImagePath(self):
+        return os.path.join(self.imagesDir, "outro.png")
+
+    def introVideoPath(self):
+        return os.path.join(self.mergedDir, "intro.mp4")
+
+    def outroVideoPath(self):
+        return os.path.join(self.mergedDir, "outro.mp4")
+
+def lastModified(path):
+    """Newest modification time of path or anything inside it"""
+    newest = os.path.getmtime(path)
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                newest = max(newest, os.path.getmtime(os.path.join(directory, name)))
+            except OSError:
+                pass
+    return newest
+
+def pruneStaleWorkspaces(maxAgeSeconds, root=None):
+    """Remove workspaces nothing has written to for maxAgeSeconds; returns the number removed"""
+    root = pathStr(root or WORKSPACES_DIR)
+    if not os.path.isdir(root):
+        return 0
+
+    # Other processes may share the root, so only workspaces idle for longer than any run are removed
+    cutoff = time.time() - maxAgeSeconds
+    removed = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if os.path.isdir(path) and lastModified(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+def resolveWorkspace(word, workspace=None):
+    """Return the given workspace, or the default one for the word, with its directories created"""
+    return (workspace or Workspace(word)).create()